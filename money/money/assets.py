@@ -1,6 +1,7 @@
 
 import os
 import time
+import numpy as np
 import pandas as pd
 import logging
 from datetime import date, datetime
@@ -8,30 +9,47 @@ from dagster import asset, AssetExecutionContext
 from typing import List, Dict, Any, Optional
 
 # Importa as classes e utilitários do seu código
-from .utils.selenium_utils import BCBAutomation
-from .repository import save_to_duckdb
-from .config import INPUT_DIR, OUTPUT_DIR, SCREENSHOTS_DIR, setup_logging
+from .resources import BCBAutomationResource
+from .utils.selenium_utils import CurrencyPair, EXCHANGE_RATE_COLUMNS
+from .repository import (
+    QUERY_DATE_COLUMN,
+    create_sample_currency_file,
+    load_cached_rates,
+    load_currency_pairs,
+    save_to_duckdb,
+    save_to_excel,
+    save_to_parquet,
+)
+from .config import INPUT_DIR, OUTPUT_DIR, SCREENSHOTS_DIR, DEFAULT_CURRENCY_FILE, DEFAULT_OUTPUT_FORMAT, setup_logging
 
 # Configurar logging
 logger = logging.getLogger("currency_automation")
 
+# Formato de data/hora usado nas estatísticas
+DISPLAY_TS_FMT = "%d/%m/%Y %H:%M:%S"
+
+
+def _run_started_at(df: pd.DataFrame) -> datetime:
+    """Retorna o horário da extração propagado junto com o dataframe de cotações"""
+    return df.attrs.get("run_started_at") or datetime.now()
+
+
 @asset(
     description="Lê os pares de moedas do arquivo de entrada",
     group_name="bcb_automation",
     compute_kind="pandas",
+    pool="pandas",
 )
 def read_currency_pairs(context: AssetExecutionContext) -> pd.DataFrame:
     """Asset que lê os pares de moedas do arquivo Excel"""
     context.log.info("Iniciando leitura de pares de moedas")
     
-    automation = BCBAutomation(headless=True)
-    currency_pairs = automation.read_currency_pairs()
+    if not os.path.exists(DEFAULT_CURRENCY_FILE):
+        context.log.warning(f"Arquivo {DEFAULT_CURRENCY_FILE} não encontrado. Criando arquivo de exemplo.")
+        create_sample_currency_file(DEFAULT_CURRENCY_FILE)
     
-    # Converte para dataframe para facilitar passagem entre assets
-    df = pd.DataFrame([
-        {"from_currency": pair.from_currency, "to_currency": pair.to_currency}
-        for pair in currency_pairs
-    ])
+    # Leitura direta com pandas, sem instanciar a automação do navegador
+    df = load_currency_pairs(DEFAULT_CURRENCY_FILE)
     
     context.log.info(f"Lidos {len(df)} pares de moedas")
     return df
@@ -41,76 +59,98 @@ def read_currency_pairs(context: AssetExecutionContext) -> pd.DataFrame:
     description="Extrai cotações do Banco Central",
     group_name="bcb_automation",
     compute_kind="selenium",
+    pool="bcb_selenium",
     deps=["read_currency_pairs"],
 )
-def extract_exchange_rates(context: AssetExecutionContext, read_currency_pairs: pd.DataFrame) -> pd.DataFrame:
+def extract_exchange_rates(context: AssetExecutionContext, bcb: BCBAutomationResource, read_currency_pairs: pd.DataFrame) -> pd.DataFrame:
     """Asset que extrai as cotações do Banco Central"""
     context.log.info("INÍCIO - Processamento de cotações")
     
-    # Inicializa a automação
-    automation = BCBAutomation(headless=True)
-    
     # Converte o dataframe para a estrutura esperada
-    from dataclasses import dataclass
-    
-    @dataclass
-    class CurrencyPair:
-        from_currency: str
-        to_currency: str
-    
     currency_pairs = [
-        CurrencyPair(
-            from_currency=row["from_currency"], 
-            to_currency=row["to_currency"]
+        CurrencyPair(from_currency=from_currency, to_currency=to_currency)
+        for from_currency, to_currency in zip(
+            read_currency_pairs["from_currency"].to_numpy(),
+            read_currency_pairs["to_currency"].to_numpy()
         )
-        for _, row in read_currency_pairs.iterrows()
     ]
     
-    # Extrai as cotações
-    try:
-        exchange_rates = automation.extract_all_exchange_rates(currency_pairs)
-        
-        # Converte para dataframe para facilitar passagem entre assets
-        results_df = pd.DataFrame([rate.to_dict() for rate in exchange_rates])
-        
-        context.log.info(f"Extração concluída: {len(results_df)} cotações processadas")
-        return results_df
-    
-    finally:
-        # Garante que o driver seja fechado
-        if hasattr(automation, 'driver') and automation.driver:
-            automation.close_driver()
+    # Horário único da execução, compartilhado com os assets seguintes
+    run_started_at = datetime.now()
+    
+    # Reaproveita as cotações do dia já salvas por execuções anteriores
+    cached_rates = load_cached_rates(currency_pairs, run_started_at.date())
+    pending_pairs = [
+        pair for pair in currency_pairs
+        if (pair.from_currency, pair.to_currency) not in cached_rates
+    ]
+    if cached_rates:
+        context.log.info(f"{len(cached_rates)} cotações reaproveitadas do cache do dia")
+    
+    # Extrai as cotações restantes (o driver é fechado pelo resource ao final da execução)
+    # As cotações chegam uma a uma e só a tupla de cada uma é mantida em memória
+    exchange_rates = bcb.iter_exchange_rates(pending_pairs) if pending_pairs else iter(())
+    new_records = [rate.to_record() for rate in exchange_rates]
+    
+    # Persiste só as cotações válidas, para que as falhas sejam consultadas de novo
+    value_idx = EXCHANGE_RATE_COLUMNS.index("Valor cotação")
+    valid_records = [record for record in new_records if record[value_idx] > 0]
+    # A data da consulta é a chave do cache (a data da cotação pode ser de outro dia)
+    if valid_records:
+        valid_df = pd.DataFrame.from_records(valid_records, columns=EXCHANGE_RATE_COLUMNS)
+        valid_df[QUERY_DATE_COLUMN] = run_started_at.strftime("%d/%m/%Y")
+        save_to_duckdb(valid_df, "exchange_rates")
+    
+    # Converte para dataframe (na ordem do arquivo de entrada) para facilitar passagem entre assets
+    records_by_pair = {
+        key: tuple(row[column] for column in EXCHANGE_RATE_COLUMNS)
+        for key, row in cached_rates.items()
+    }
+    records_by_pair.update({(record[0], record[2]): record for record in new_records})
+    results_df = pd.DataFrame.from_records(
+        [records_by_pair[(pair.from_currency, pair.to_currency)] for pair in currency_pairs],
+        columns=EXCHANGE_RATE_COLUMNS
+    )
+    
+    # Colunas com poucos valores distintos ficam como category (códigos inteiros)
+    results_df["Status"] = results_df["Status"].astype("category")
+    results_df["Moeda entrada"] = results_df["Moeda entrada"].astype("category")
+    results_df.attrs["run_started_at"] = run_started_at
+    
+    context.log.info(f"Extração concluída: {len(results_df)} cotações processadas")
+    return results_df
 
 
 @asset(
-    description="Salva as cotações em formato Excel",
+    description="Salva as cotações em Parquet e, opcionalmente, em Excel",
     group_name="bcb_automation",
     compute_kind="pandas",
+    pool="pandas",
     deps=["extract_exchange_rates"],
 )
 def save_exchange_rates(context: AssetExecutionContext, extract_exchange_rates: pd.DataFrame) -> str:
-    """Asset que salva as cotações em um arquivo Excel"""
-    context.log.info("Salvando cotações em Excel")
+    """Asset que salva as cotações no formato configurado em DEFAULT_OUTPUT_FORMAT"""
+    context.log.info("Salvando cotações")
     
     if extract_exchange_rates.empty:
         context.log.warning("Nenhuma cotação para salvar")
         return "Nenhum arquivo gerado"
     
-    # Salva o arquivo de saída
-    automation = BCBAutomation(headless=True)
+    # O nome do arquivo depende só da execução (ou partição): reexecuções sobrescrevem o mesmo arquivo
+    run_tag = context.partition_key if context.has_partition_key else context.run_id
+    base_path = os.path.join(OUTPUT_DIR, f"exchange_rates_{run_tag}")
     
-    # Usa a estrutura do dataframe diretamente para salvar
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"exchange_rates_{timestamp}.xlsx"
-    output_path = os.path.join(OUTPUT_DIR, filename)
+    # Parquet é sempre gerado: é o formato mais rápido para leituras posteriores
+    output_path = save_to_parquet(extract_exchange_rates, f"{base_path}.parquet")
+    if output_path:
+        context.log.info(f"Arquivo Parquet salvo em: {output_path}")
     
-    # Garante que o diretório existe
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Excel só quando configurado (ou se o Parquet não pôde ser gerado)
+    if DEFAULT_OUTPUT_FORMAT == "xlsx" or not output_path:
+        # Salva o dataframe linha a linha, sem montar o workbook inteiro em memória
+        output_path = save_to_excel(extract_exchange_rates, f"{base_path}.xlsx")
+        context.log.info(f"Arquivo Excel salvo em: {output_path}")
     
-    # Salva o dataframe
-    extract_exchange_rates.to_excel(output_path, index=False)
-    
-    context.log.info(f"Arquivo Excel salvo em: {output_path}")
     return output_path
 
 
@@ -118,6 +158,7 @@ def save_exchange_rates(context: AssetExecutionContext, extract_exchange_rates:
     description="Analisa estatísticas das cotações",
     group_name="bcb_automation",
     compute_kind="pandas",
+    pool="pandas",
     deps=["extract_exchange_rates"],
 )
 def analyze_exchange_rates(context: AssetExecutionContext, extract_exchange_rates: pd.DataFrame) -> Dict[str, Any]:
@@ -127,14 +168,25 @@ def analyze_exchange_rates(context: AssetExecutionContext, extract_exchange_rate
     if extract_exchange_rates.empty:
         return {"status": "Nenhum dado para análise"}
     
+    # Conta os status numa única passada sobre os códigos da coluna category;
+    # os testes de texto rodam só sobre as categorias distintas
+    status = extract_exchange_rates["Status"].astype("category")
+    categories = status.cat.categories
+    codes = status.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    
+    ok_codes = np.flatnonzero(categories == "Consulta ok")
+    data_diff_codes = np.flatnonzero(categories.str.contains("não é da data", regex=False))
+    error_codes = np.flatnonzero(categories.str.contains("Erro", regex=False))
+    
     # Calcula estatísticas básicas
     stats = {
         "total_cotacoes": len(extract_exchange_rates),
-        "cotacoes_ok": len(extract_exchange_rates[extract_exchange_rates["Status"] == "Consulta ok"]),
-        "cotacoes_data_diferente": len(extract_exchange_rates[extract_exchange_rates["Status"].str.contains("não é da data", na=False)]),
-        "cotacoes_erro": len(extract_exchange_rates[extract_exchange_rates["Status"].str.contains("Erro", na=False)]),
-        "moedas_unicas": len(extract_exchange_rates["Moeda entrada"].unique()),
-        "data_execucao": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        "cotacoes_ok": int(counts[ok_codes].sum()),
+        "cotacoes_data_diferente": int(counts[data_diff_codes].sum()),
+        "cotacoes_erro": int(counts[error_codes].sum()),
+        "moedas_unicas": extract_exchange_rates["Moeda entrada"].nunique(dropna=False),
+        "data_execucao": _run_started_at(extract_exchange_rates).strftime(DISPLAY_TS_FMT)
     }
     
     # Registra no log as estatísticas
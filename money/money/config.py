@@ -2,6 +2,9 @@
 
 import os
 import logging
+import logging.handlers
+import queue
+import atexit
 import sys
 import io
 from datetime import date
@@ -18,55 +21,86 @@ IMPLEMENTATION = "selenium"  # "selenium" ou "scrapy"
 # Configurações do Selenium
 HEADLESS = True  # Se True, o navegador roda em modo headless
 TAKE_SCREENSHOTS = True  # Se True, screenshots são salvas durante a execução
+MAX_WORKERS = 4  # Número de navegadores consultando cotações em paralelo
 
 # Configuração de parâmetros de consulta
 DEFAULT_CURRENCY_FILE = os.path.join(INPUT_DIR, "currencies.xlsx")
-DEFAULT_OUTPUT_FORMAT = "xlsx"  # Formato de saída padrão (xlsx, csv, json)
+DEFAULT_OUTPUT_FORMAT = "xlsx"  # Formato de saída padrão (xlsx ou parquet); o Parquet é sempre gerado
 
 # Configurações de timeout e retry
 REQUEST_TIMEOUT = 30  # Timeout para requisições em segundos
 MAX_RETRIES = 3  # Número máximo de tentativas em caso de falha
 
 # Garante que os diretórios existem
-# os.makedirs(INPUT_DIR, exist_ok=True)
-# os.makedirs(OUTPUT_DIR, exist_ok=True)
-# os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
-# os.makedirs(LOGS_DIR, exist_ok=True)
+os.makedirs(INPUT_DIR, exist_ok=True)
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+os.makedirs(LOGS_DIR, exist_ok=True)
+
+# setup_logging só configura handlers/threads na primeira chamada do processo
+_logging_configured = False
+
+
+def queued_handler(*handlers: logging.Handler) -> logging.handlers.QueueHandler:
+    """Cria um QueueHandler cujos registros são gravados nos handlers por uma thread separada"""
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    # Descarrega a fila antes de encerrar o processo
+    atexit.register(listener.stop)
+
+    return logging.handlers.QueueHandler(log_queue)
+
 
 def setup_logging():
-    """Configura o logging para o projeto"""
+    """Configura o logging para o projeto (chamadas repetidas só retornam os loggers)"""
+    global _logging_configured
+
+    # Logger principal
+    logger = logging.getLogger("money")
+    # Logger separado para logs detalhados/técnicos
+    debug_logger = logging.getLogger("debug_logger")
+
+    # Já configurado: não cria novas threads de escrita nem duplica handlers
+    if _logging_configured:
+        return logger, debug_logger
+    _logging_configured = True
+
     # Configuração para lidar com caracteres especiais nos logs
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
     # Nome do arquivo de log
-    log_file = os.path.join(
-        LOGS_DIR, f"money_{date.today().strftime('%Y%m%d')}.log")
+    today = date.today().strftime('%Y%m%d')
+    log_file = os.path.join(LOGS_DIR, f"money_{today}.log")
 
     # Formato simplificado para os logs principais
-    logging.basicConfig(
-        level=logging.INFO,
-        format="[%(asctime)s] [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    root_logger = logging.getLogger()
+    if not root_logger.handlers:
+        formatter = logging.Formatter(
+            "[%(asctime)s] [%(levelname)s] %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
 
-    # Logger principal
-    logger = logging.getLogger("money")
+        # A escrita em arquivo/console fica fora da thread que gera o log
+        root_logger.addHandler(queued_handler(file_handler, stream_handler))
+        root_logger.setLevel(logging.INFO)
 
-    # Logger separado para logs detalhados/técnicos
-    debug_logger = logging.getLogger("debug_logger")
-    debug_log_file = os.path.join(
-        LOGS_DIR, f"debug_{date.today().strftime('%Y%m%d')}.log")
-    debug_handler = logging.FileHandler(debug_log_file, encoding='utf-8')
-    debug_handler.setFormatter(logging.Formatter(
-        "[%(asctime)s] %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
-        datefmt="%d/%m/%Y %H:%M:%S"
-    ))
-    debug_logger.addHandler(debug_handler)
+    # O arquivo de debug pode já ter sido configurado pelo selenium_utils
+    if not debug_logger.handlers:
+        debug_log_file = os.path.join(LOGS_DIR, f"debug_{today}.log")
+        debug_handler = logging.FileHandler(debug_log_file, encoding='utf-8')
+        debug_handler.setFormatter(logging.Formatter(
+            "[%(asctime)s] %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
+            datefmt="%d/%m/%Y %H:%M:%S"
+        ))
+        debug_logger.addHandler(queued_handler(debug_handler))
     debug_logger.setLevel(logging.DEBUG)
     
-    return logger, debug_logger
\ No newline at end of file
+    return logger, debug_logger
@@ -7,6 +7,7 @@ from dagster import (
 )
 
 from . import assets
+from .resources import BCBAutomationResource
 
 # Carrega todos os assets do módulo 'assets'
 all_assets = load_assets_from_modules([assets])
@@ -32,5 +33,6 @@ bcb_daily_schedule = ScheduleDefinition(
 defs = Definitions(
     assets=all_assets,
     schedules=[bcb_daily_schedule],
+    resources={"bcb": BCBAutomationResource(headless=True)},
 )
 
@@ -4,49 +4,78 @@ Se quiser implementar salvamento em banco de dados
 """
 
 import os
+import csv
+import functools
 import pandas as pd
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import date, datetime
+from typing import List, Dict, Any, Iterable, Sequence, Tuple, Union
 
 logger = logging.getLogger("currency_automation")
 
-def save_to_duckdb(data: List[Dict[str, Any]], table_name: str) -> bool:
+# Arquivo do banco DuckDB na raiz do projeto
+DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.duckdb")
+
+# Tabelas que podem ser usadas nas consultas (os nomes entram direto no SQL)
+ALLOWED_TABLES = {"exchange_rates"}
+
+# Coluna com a data em que a cotação foi consultada (a coluna "Data" é a data
+# da cotação devolvida pelo BCB, que pode ser de um dia anterior)
+QUERY_DATE_COLUMN = "Data consulta"
+
+# Tabelas já criadas neste processo (o CREATE TABLE roda uma vez só)
+_created_tables = set()
+
+
+def _connect(read_only: bool = False):
+    """
+    Abre uma conexão DuckDB para uma única operação (usar com 'with')
+    
+    A conexão não fica aberta entre operações para não manter a trava de escrita
+    do arquivo, que impediria outros processos de usar o banco.
+    """
+    import duckdb
+    
+    return duckdb.connect(DB_FILE, read_only=read_only)
+
+
+def _check_table_name(table_name: str) -> None:
+    """Garante que o nome da tabela é conhecido antes de usá-lo no SQL"""
+    if table_name not in ALLOWED_TABLES:
+        raise ValueError(f"Tabela não permitida: {table_name}")
+
+
+def save_to_duckdb(data: Union[List[Dict[str, Any]], pd.DataFrame], table_name: str) -> bool:
     """
     Salva dados em DuckDB (opcional)
     
     Args:
-        data: Lista de dicionários com os dados
+        data: Lista de dicionários ou DataFrame com os dados
         table_name: Nome da tabela para salvar
         
     Returns:
         bool: True se salvou com sucesso, False caso contrário
     """
     try:
-        import duckdb
+        _check_table_name(table_name)
         
         # Converte para DataFrame
         df = pd.DataFrame(data)
         
-        # Conecta ao DuckDB
-        db_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.duckdb")
-        
-        # Cria ou atualiza a tabela
-        with duckdb.connect(db_file) as conn:
-            # Registra o DataFrame
-            conn.register("df_view", df)
+        with _connect() as conn:
+            # Cria a tabela (vazia, com o esquema do DataFrame) uma vez por processo
+            if table_name not in _created_tables:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM df LIMIT 0")
+                # Tabelas criadas por versões anteriores ganham as colunas novas do DataFrame
+                table_columns = {row[0] for row in conn.execute(f"DESCRIBE {table_name}").fetchall()}
+                for column, column_type, *_ in conn.execute("DESCRIBE SELECT * FROM df").fetchall():
+                    if column not in table_columns:
+                        conn.execute(f'ALTER TABLE {table_name} ADD COLUMN "{column}" {column_type}')
+                _created_tables.add(table_name)
             
-            # Verifica se a tabela existe
-            table_exists = conn.execute(
-                f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name = '{table_name}'"
-            ).fetchone()[0]
-            
-            if table_exists:
-                # Apenda os dados à tabela existente
-                conn.execute(f"INSERT INTO {table_name} SELECT * FROM df_view")
-            else:
-                # Cria a tabela
-                conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df_view")
+            # Apenda os dados pelo nome das colunas (não pela posição);
+            # o DuckDB lê o DataFrame local 'df' diretamente
+            conn.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM df")
                 
         logger.info(f"Dados salvos com sucesso na tabela {table_name}")
         return True
@@ -56,23 +85,172 @@ def save_to_duckdb(data: List[Dict[str, Any]], table_name: str) -> bool:
         return False
 
 
-def save_to_csv(data: List[Dict[str, Any]], file_path: str) -> str:
+def load_cached_rates(pairs: List[Any], as_of: date, table_name: str = "exchange_rates") -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Carrega do DuckDB as cotações válidas já consultadas na data informada
+    
+    Args:
+        pairs: Pares de moedas (com atributos from_currency e to_currency)
+        as_of: Data da consulta (coluna QUERY_DATE_COLUMN), não a data da cotação
+        table_name: Nome da tabela de cotações
+        
+    Returns:
+        dict: Linhas encontradas, indexadas por (moeda entrada, moeda saída)
+    """
+    if not os.path.exists(DB_FILE):
+        return {}
+    
+    try:
+        _check_table_name(table_name)
+        
+        wanted = {(pair.from_currency, pair.to_currency) for pair in pairs}
+        
+        with _connect(read_only=True) as conn:
+            df = conn.execute(
+                f'SELECT * FROM {table_name} WHERE "{QUERY_DATE_COLUMN}" = ? AND "Valor cotação" > 0',
+                [as_of.strftime("%d/%m/%Y")]
+            ).df()
+        
+        # Filtra pelos pares pedidos sobre as colunas; só as linhas mantidas viram dicionários
+        keys = zip(df["Moeda entrada"].to_numpy(), df["Moeda saída"].to_numpy())
+        df = df[[key in wanted for key in keys]]
+        
+        cached = {}
+        for row in df.to_dict("records"):
+            cached[(row["Moeda entrada"], row["Moeda saída"])] = row
+        
+        logger.info(f"{len(cached)} cotações de {as_of.strftime('%d/%m/%Y')} encontradas em {table_name}")
+        return cached
+    
+    except Exception as e:
+        logger.error(f"Erro ao carregar cotações do DuckDB: {str(e)}")
+        return {}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_currency_file(file_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Lê o arquivo de pares de moedas; mtime e tamanho fazem parte da chave do cache"""
+    # CSV dispensa o parser de Excel
+    if file_path.lower().endswith(".csv"):
+        df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+        header, rows = list(df.columns), df.itertuples(index=False, name=None)
+    else:
+        header, rows = _read_excel_rows(file_path)
+    
+    if "Moeda Origem" in header and "Moeda Destino" in header:
+        # Formato português
+        index_from, index_to = header.index("Moeda Origem"), header.index("Moeda Destino")
+    elif "from" in header and "to" in header:
+        # Formato inglês
+        index_from, index_to = header.index("from"), header.index("to")
+    elif len(header) >= 2:
+        # Usa as duas primeiras colunas, independente dos nomes
+        index_from, index_to = 0, 1
+    else:
+        raise ValueError("Arquivo precisa ter pelo menos duas colunas")
+    
+    from_currencies, to_currencies = [], []
+    for row in rows:
+        from_value = row[index_from] if index_from < len(row) else None
+        to_value = row[index_to] if index_to < len(row) else None
+        # Células vazias são ignoradas antes da conversão, senão viram a moeda "None"
+        if from_value is None or to_value is None:
+            continue
+        from_currency = str(from_value).strip().upper()
+        to_currency = str(to_value).strip().upper()
+        if not from_currency or not to_currency:
+            continue
+        from_currencies.append(from_currency)
+        to_currencies.append(to_currency)
+    
+    return pd.DataFrame({"from_currency": from_currencies, "to_currency": to_currencies})
+
+
+def _read_excel_rows(file_path: str) -> Tuple[List[str], List[tuple]]:
+    """Lê o cabeçalho e as linhas da primeira planilha com o openpyxl em modo read_only"""
+    from openpyxl import load_workbook
+    
+    # read_only lê as células em streaming, sem carregar estilos nem montar o modelo completo
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(name) if name is not None else "" for name in next(rows, ())]
+        return header, list(rows)
+    finally:
+        workbook.close()
+
+
+def load_currency_pairs(file_path: str) -> pd.DataFrame:
+    """
+    Lê os pares de moedas de um arquivo Excel (ou CSV, pela extensão)
+    
+    O resultado fica em cache enquanto o arquivo não for alterado.
+    
+    Args:
+        file_path: Caminho do arquivo de pares de moedas (.xlsx ou .csv)
+        
+    Returns:
+        pd.DataFrame: Colunas from_currency e to_currency
+    """
+    st = os.stat(file_path)
+    return _read_currency_file(file_path, st.st_mtime_ns, st.st_size).copy()
+
+
+def create_sample_currency_file(file_path: str) -> str:
+    """
+    Cria um arquivo de exemplo com pares de moedas
+    
+    Args:
+        file_path: Caminho do arquivo a ser criado (sobrescrito se existir)
+        
+    Returns:
+        str: Caminho do arquivo criado
+    """
+    data = {
+        'Moeda Origem': ['USD', 'EUR', 'GBP', 'JPY', 'BRL'],
+        'Moeda Destino': ['BRL', 'BRL', 'BRL', 'BRL', 'USD']
+    }
+    
+    # Garante que o diretório existe
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    
+    pd.DataFrame(data).to_excel(file_path, index=False)
+    
+    logger.info(f"Arquivo de exemplo criado em {file_path}")
+    return file_path
+
+
+def _write_csv(data: Union[List[Dict[str, Any]], pd.DataFrame], file_path: str) -> None:
+    """Escreve os dados em CSV; listas de dicionários são gravadas sem passar pelo pandas"""
+    if isinstance(data, pd.DataFrame):
+        data.to_csv(file_path, index=False)
+        return
+    
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        if not data:
+            return
+        
+        # Colunas na ordem em que aparecem, como faria o pd.DataFrame
+        columns = list(dict.fromkeys(key for row in data for key in row))
+        
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows([row.get(column) for column in columns] for row in data)
+
+
+def save_to_csv(data: Union[List[Dict[str, Any]], pd.DataFrame], file_path: str) -> str:
     """
     Salva dados em CSV
     
     Args:
-        data: Lista de dicionários com os dados
+        data: Lista de dicionários ou DataFrame com os dados
         file_path: Caminho para o arquivo CSV
         
     Returns:
         str: Caminho do arquivo salvo
     """
     try:
-        # Converte para DataFrame
-        df = pd.DataFrame(data)
-        
-        # Salva em CSV
-        df.to_csv(file_path, index=False)
+        _write_csv(data, file_path)
         
         logger.info(f"Dados salvos com sucesso em {file_path}")
         return file_path
@@ -82,8 +260,88 @@ def save_to_csv(data: List[Dict[str, Any]], file_path: str) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         alt_file_path = file_path.replace(".csv", f"_error_{timestamp}.csv")
         try:
-            df.to_csv(alt_file_path, index=False)
+            _write_csv(data, alt_file_path)
             logger.info(f"Dados salvos em caminho alternativo: {alt_file_path}")
             return alt_file_path
         except:
-            return ""
\ No newline at end of file
+            return ""
+
+
+def save_to_excel(df: pd.DataFrame, file_path: str) -> str:
+    """
+    Salva um DataFrame em Excel escrevendo as linhas em modo streaming
+    
+    Args:
+        df: DataFrame com os dados
+        file_path: Caminho para o arquivo Excel
+        
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    return save_records_to_excel(list(df.columns), df.itertuples(index=False, name=None), file_path)
+
+
+def save_records_to_excel(header: List[str], rows: Iterable[Sequence[Any]], file_path: str) -> str:
+    """
+    Salva linhas (tuplas na ordem do cabeçalho) em Excel, sem montar um DataFrame
+    
+    Usa o xlsxwriter em modo constant_memory quando disponível e, caso
+    contrário, o openpyxl em modo write_only.
+    
+    Args:
+        header: Nomes das colunas
+        rows: Linhas com os valores na ordem das colunas
+        file_path: Caminho para o arquivo Excel
+        
+    Returns:
+        str: Caminho do arquivo salvo
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+    
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True, "nan_inf_to_errors": True})
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, header)
+        for i, row in enumerate(rows, start=1):
+            worksheet.write_row(i, 0, row)
+        workbook.close()
+    else:
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(header)
+        for row in rows:
+            worksheet.append(row)
+        workbook.save(file_path)
+    
+    logger.info(f"Dados salvos com sucesso em {file_path}")
+    return file_path
+
+
+def save_to_parquet(df: pd.DataFrame, file_path: str) -> str:
+    """
+    Salva um DataFrame em Parquet (pyarrow, compressão zstd)
+    
+    Args:
+        df: DataFrame com os dados
+        file_path: Caminho para o arquivo Parquet
+        
+    Returns:
+        str: Caminho do arquivo salvo, ou "" se não foi possível salvar
+    """
+    try:
+        df.to_parquet(file_path, engine="pyarrow", compression="zstd", index=False)
+        
+        logger.info(f"Dados salvos com sucesso em {file_path}")
+        return file_path
+    
+    except ImportError:
+        logger.warning("Pacote 'pyarrow' não encontrado. Arquivo Parquet não gerado.")
+        return ""
+    except Exception as e:
+        logger.error(f"Erro ao salvar dados em Parquet: {str(e)}")
+        return ""
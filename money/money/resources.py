@@ -0,0 +1,47 @@
+"""Resources do Dagster compartilhados entre os assets"""
+
+from datetime import date
+from typing import Iterator, List, Optional
+
+from dagster import ConfigurableResource, InitResourceContext
+from pydantic import PrivateAttr
+
+from .config import MAX_WORKERS
+from .utils.selenium_utils import BCBAutomation, CurrencyPair, ExchangeRate
+
+
+class BCBAutomationResource(ConfigurableResource):
+    """Resource que mantém uma única instância de BCBAutomation (e seu WebDriver) por execução"""
+
+    headless: bool = True
+    debug_screenshots: bool = False
+    max_workers: int = MAX_WORKERS
+
+    _automation: Optional[BCBAutomation] = PrivateAttr(default=None)
+
+    def get_automation(self) -> BCBAutomation:
+        """Retorna a instância de BCBAutomation, criando-a apenas no primeiro uso"""
+        if self._automation is None:
+            self._automation = BCBAutomation(
+                headless=self.headless,
+                debug_screenshots=self.debug_screenshots,
+                max_workers=self.max_workers
+            )
+        return self._automation
+
+    def read_currency_pairs(self) -> List[CurrencyPair]:
+        """Lê os pares de moedas do arquivo de entrada"""
+        return self.get_automation().read_currency_pairs()
+
+    def iter_exchange_rates(self, currency_pairs: List[CurrencyPair], rate_date: Optional[date] = None) -> Iterator[ExchangeRate]:
+        """Extrai as cotações uma a uma, reaproveitando o driver da execução"""
+        return self.get_automation().iter_exchange_rates(currency_pairs, rate_date)
+
+    def extract_all_exchange_rates(self, currency_pairs: List[CurrencyPair], rate_date: Optional[date] = None) -> List[ExchangeRate]:
+        """Extrai as cotações reaproveitando o driver da execução"""
+        return self.get_automation().extract_all_exchange_rates(currency_pairs, rate_date)
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        # Garante que o driver seja fechado ao final da execução
+        if self._automation is not None:
+            self._automation.close_driver()
@@ -1,30 +1,21 @@
 """Spider para extração de cotações do Banco Central do Brasil"""
 # Executar com: scrapy runspider money\money\spiders\moedas_spider.py
 import scrapy
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import (
-    ElementClickInterceptedException, 
-    TimeoutException, 
-    NoSuchElementException,
-    WebDriverException,
-    StaleElementReferenceException
-)
-from datetime import date, datetime
+from scrapy.extensions.httpcache import DummyPolicy
+from scrapy.exporters import BaseItemExporter
+from scrapy.utils.defer import maybe_deferred_to_future
+# Selenium e webdriver-manager são importados só nos métodos que usam o navegador,
+# para que listar/checar o spider não pague o custo dessas importações
+from datetime import date
 import re
 import time
 import json
-import pandas as pd
+import threading
+import collections
+import shelve
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from webdriver_manager.chrome import ChromeDriverManager
-import requests
 import sys
 import os
 
@@ -63,42 +54,220 @@ except ImportError:
         def add_warning(self, id): pass
         def finish(self, id): pass
 
-@dataclass
+# Moedas com cotação PTAX disponível na API Olinda do BCB (sempre contra BRL)
+API_CURRENCIES = {'USD', 'EUR', 'GBP', 'JPY', 'CAD', 'AUD', 'CHF'}
+
+API_URL = (
+    "https://olinda.bcb.gov.br/olinda/servico/PTAX/versao/v1/odata/"
+    "CotacaoMoedaDia(moeda=@moeda,dataCotacao=@dataCotacao)"
+    "?@moeda='{moeda}'&@dataCotacao='{data}'&$top=1&$orderby=dataHoraCotacao%20desc"
+    "&$format=json&$select=cotacaoCompra,cotacaoVenda,dataHoraCotacao"
+)
+
+# Recursos de terceiros que não influenciam a cotação e são bloqueados no navegador
+BLOCKED_URLS = [
+    "*google-analytics*", "*googletagmanager*", "*fonts.googleapis*", "*fonts.gstatic*",
+    "*doubleclick*", "*facebook*", "*.png", "*.jpg", "*.svg", "*.woff*",
+]
+
+# Caminho do chromedriver resolvido pelo webdriver-manager, reaproveitado por até um dia
+DRIVER_PATH_CACHE = Path.home() / ".cache" / "bcb_spider" / "chromedriver"
+DRIVER_PATH_TTL = 86400
+
+# Validade das cotações em cache: as do dia ainda podem mudar, as passadas não
+CACHE_TTL_TODAY = 600
+CACHE_TTL_PAST = 365 * 86400
+
+# Padrões usados na extração do resultado, compilados uma única vez
+_RATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in (
+        r'1\s*USD\s*=\s*R\$?\s*([0-9]+[.,][0-9]+)',
+        r'1\s*Dólar.*?([0-9]+[.,][0-9]+).*?Real',
+        r'USD.*?([0-9]+[.,][0-9]{4,6}).*?BRL',
+        r'Resultado.*?([0-9]+[.,][0-9]+)',
+        r'Valor.*?([0-9]+[.,][0-9]+)',
+        r'Cotação.*?([0-9]+[.,][0-9]+)',
+        r'([4-8][.,][0-9]{4,6})',
+        r'([0-9]{1,2}[.,][0-9]{4,6})',
+        r'content="([0-9]+[.,][0-9]+)"',
+        r'value="([0-9]+[.,][0-9]+)"',
+        r'data-rate="([0-9]+[.,][0-9]+)"',
+    )
+]
+# Todos os padrões exigem um número decimal: sem ele no texto, nenhum padrão é executado
+_DECIMAL_HINT = re.compile(r'[0-9][.,][0-9]')
+_DATE_PATTERNS = [
+    re.compile(r'(\d{2}/\d{2}/\d{4})'),
+    re.compile(r'(\d{4}-\d{2}-\d{2})'),
+    re.compile(r'(\d{2}-\d{2}-\d{4})'),
+]
+_NON_NUMERIC = re.compile(r'[^\d.,]')
+
+# Texto visível do resultado (só o container, se existir), lido numa única chamada
+_RESULT_TEXT_JS = """
+const card = document.querySelector('.card-body');
+if (card && card.innerText.trim()) return card.innerText;
+return document.body ? document.body.innerText : '';
+"""
+
+# Atributos content/value/data-rate da página no formato nome="valor", para os padrões de
+# atributo, sem transferir o HTML inteiro (page_source)
+_RATE_ATTRIBUTES_JS = """
+const parts = [];
+for (const el of document.querySelectorAll('[content], [value], [data-rate]')) {
+    for (const name of ['content', 'value', 'data-rate']) {
+        const value = el.getAttribute(name);
+        if (value) parts.push(`${name}="${value}"`);
+    }
+}
+return parts.join('\\n');
+"""
+
+# Mesmo texto, mas só devolvido se já contém alguma das palavras esperadas (arguments[0]);
+# o teste roda no navegador e o texto só é transferido quando o resultado está pronto
+_MATCHING_RESULT_TEXT_JS = """
+const card = document.querySelector('.card-body');
+const text = (card && card.innerText.trim()) ? card.innerText : (document.body ? document.body.innerText : '');
+const lowered = text.toLowerCase();
+return arguments[0].some(keyword => lowered.includes(keyword)) ? text : null;
+"""
+
+def _parse_ddmmyyyy(value: str) -> date:
+    """Converte DD/MM/AAAA (ou DD-MM-AAAA) sem passar pelo strptime"""
+    return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+def _chromedriver_path() -> str:
+    """Retorna o caminho do chromedriver, consultando o webdriver-manager só sem cache válido"""
+    try:
+        if time.time() - DRIVER_PATH_CACHE.stat().st_mtime < DRIVER_PATH_TTL:
+            cached_path = DRIVER_PATH_CACHE.read_text(encoding="utf-8").strip()
+            if cached_path and os.path.exists(cached_path):
+                return cached_path
+    except OSError:
+        pass
+    
+    # webdriver-manager lê as variáveis na importação: drivers no diretório do projeto e sem logs próprios
+    os.environ.setdefault("WDM_LOCAL", "1")
+    os.environ.setdefault("WDM_LOG_LEVEL", "0")
+    from webdriver_manager.chrome import ChromeDriverManager
+    
+    driver_path = ChromeDriverManager().install()
+    try:
+        DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        DRIVER_PATH_CACHE.write_text(driver_path, encoding="utf-8")
+    except OSError:
+        pass
+    return driver_path
+
+@dataclass(frozen=True)
 class CurrencyPair:
-    from_currency: str
-    to_currency: str
+    __slots__ = ("from_currency", "to_currency")
 
-@dataclass
-class ExchangeRate:
     from_currency: str
     to_currency: str
-    rate_value: float
-    rate_date: date
-    status: str
-    execution_time: float = 0.0
-
-    def to_dict(self) -> dict:
-        return {
-            "Moeda entrada": self.from_currency,
-            "Moeda saída": self.to_currency,
-            "Valor cotação": round(self.rate_value, 6) if self.rate_value else 0.0,
-            "Data": self.rate_date.strftime("%d/%m/%Y"),
-            "Status": self.status,
-            "Tempo (s)": round(self.execution_time, 2)
-        }
+
+class ExchangeRateItem(scrapy.Item):
+    """Cotação emitida pelo spider; a formatação fica nos serializers dos campos"""
+    moeda_entrada = scrapy.Field()
+    moeda_saida = scrapy.Field()
+    valor_cotacao = scrapy.Field(serializer=lambda value: round(value, 6) if value else 0.0)
+    data = scrapy.Field(serializer=lambda value: value.strftime("%d/%m/%Y"))
+    status = scrapy.Field()
+    tempo_s = scrapy.Field(serializer=lambda value: round(value, 2))
+
+# Colunas dos arquivos exportados, na ordem e com os nomes de saída
+ITEM_COLUMNS = {
+    "moeda_entrada": "Moeda entrada",
+    "moeda_saida": "Moeda saída",
+    "valor_cotacao": "Valor cotação",
+    "data": "Data",
+    "status": "Status",
+    "tempo_s": "Tempo (s)",
+}
+
+class XlsxItemExporter(BaseItemExporter):
+    """Exporta os itens para Excel linha a linha (openpyxl em modo write_only)"""
+
+    def __init__(self, file, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+        self._workbook = None
+        self._sheet = None
+        self._header_written = False
+
+    def start_exporting(self):
+        from openpyxl import Workbook
+        
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+
+    def export_item(self, item):
+        fields = list(self._get_serialized_fields(item, default_value="", include_empty=True))
+        if not self._header_written:
+            self._sheet.append([name for name, _ in fields])
+            self._header_written = True
+        self._sheet.append([value for _, value in fields])
+
+    def finish_exporting(self):
+        self._workbook.save(self.file)
+
+class PtaxCachePolicy(DummyPolicy):
+    """Política do cache HTTP que não guarda respostas da API PTAX sem cotação"""
+
+    def should_cache_response(self, response, request):
+        if not super().should_cache_response(response, request):
+            return False
+        if not request.meta.get('ptax_api'):
+            return True
+        # Cotação ainda não publicada (ou fim de semana/feriado): consulta de novo na próxima execução
+        try:
+            return bool(json.loads(response.body).get('value'))
+        except (ValueError, AttributeError):
+            return False
 
 class MoedasSpider(scrapy.Spider):
     name = "moedas"
     start_urls = ["https://www.bcb.gov.br/conversao"]
     
+    # Navegadores consultando a página de conversão em paralelo
+    max_workers = 4
+    
+    # Caminho do chromedriver, resolvido uma vez por processo (complementa o cache em disco)
+    _DRIVER_PATH = None
+    _DRIVER_PATH_LOCK = threading.Lock()
+    
     custom_settings = {
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'ROBOTSTXT_OBEY': False,
-        'DOWNLOAD_DELAY': 1,
+        'DOWNLOAD_DELAY': 0,
         'LOG_LEVEL': 'ERROR',
         'TELNETCONSOLE_ENABLED': False,
         'DOWNLOAD_TIMEOUT': 30,
-        'CONCURRENT_REQUESTS': 1,
+        # As consultas à API são feitas em paralelo pelo próprio Scrapy
+        'CONCURRENT_REQUESTS': 16,
+        'AUTOTHROTTLE_ENABLED': True,
+        # Falhas transitórias do servidor são repetidas pelo próprio downloader
+        'RETRY_TIMES': 2,
+        'RETRY_HTTP_CODES': [502, 503, 504],
+        # Cache HTTP do dia: execuções repetidas reaproveitam a página de conversão
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_EXPIRATION_SECS': 86400,
+        'HTTPCACHE_STORAGE': 'scrapy.extensions.httpcache.FilesystemCacheStorage',
+        'HTTPCACHE_DIR': f"httpcache/{date.today().isoformat()}",
+        # Erros do servidor não são guardados, senão as novas tentativas sairiam do cache
+        'HTTPCACHE_IGNORE_HTTP_CODES': [500, 502, 503, 504],
+        'HTTPCACHE_POLICY': PtaxCachePolicy,
+        # Os itens são gravados pelos feed exporters à medida que são emitidos
+        'FEEDS': {
+            'money/assets/output/cotacoes_%(time)s.xlsx': {'format': 'xlsx'},
+            'money/assets/output/cotacoes_%(time)s.csv': {'format': 'csv', 'encoding': 'utf-8-sig'},
+            'money/assets/output/cotacoes_latest.json': {
+                'format': 'json', 'encoding': 'utf8', 'indent': 2, 'overwrite': True,
+            },
+        },
+        'FEED_EXPORTERS': {'xlsx': XlsxItemExporter},
+        'FEED_EXPORT_FIELDS': ITEM_COLUMNS,
     }
 
     def __init__(self):
@@ -114,8 +283,23 @@ class MoedasSpider(scrapy.Spider):
         
         self.currency_pairs = self._load_currency_pairs()
         self.target_date = date.today()
-        self.results = []
-        self.driver = None
+        
+        # Contagem por status e tempo total, atualizados a cada resultado
+        self._status_counts = collections.Counter()
+        self._total_time = 0.0
+        self._counts_lock = threading.Lock()
+        
+        # Cada thread de consulta usa o seu próprio navegador;
+        # o tempo total cai para ~ceil(N/workers) consultas
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        
+        # Cache em disco das cotações obtidas pelo navegador
+        self._cache = shelve.open(str(self.output_dir / ".bcb_rate_cache"))
+        self._cache_lock = threading.Lock()
+        self.operation_id = "cotacao_extraction"
         
         # Log inicial limpo
         self.custom_logger.info("Sistema de Cotações BCB v2.0")
@@ -131,26 +315,36 @@ class MoedasSpider(scrapy.Spider):
             return [CurrencyPair("USD", "BRL"), CurrencyPair("EUR", "BRL")]
         
         try:
-            df = pd.read_excel(excel_file)
-            pairs = []
-            
-            cols_lower = [col.lower() for col in df.columns]
-            from_col = None
-            to_col = None
+            from openpyxl import load_workbook
             
-            for i, col_name in enumerate(df.columns):
-                col_lower = cols_lower[i]
-                if any(keyword in col_lower for keyword in ['from', 'origem', 'entrada']):
-                    from_col = col_name
-                elif any(keyword in col_lower for keyword in ['to', 'destino', 'saída', 'saida']):
-                    to_col = col_name
+            pairs = []
             
-            if from_col and to_col:
-                for _, row in df.iterrows():
-                    from_curr = str(row[from_col]).strip().upper()
-                    to_curr = str(row[to_col]).strip().upper()
-                    if len(from_curr) == 3 and len(to_curr) == 3:
-                        pairs.append(CurrencyPair(from_curr, to_curr))
+            # Leitura em streaming das células, sem montar um DataFrame
+            workbook = load_workbook(excel_file, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = next(rows, ())
+                from_col = None
+                to_col = None
+                
+                for i, col_name in enumerate(header):
+                    col_lower = str(col_name).lower() if col_name is not None else ''
+                    if any(keyword in col_lower for keyword in ['from', 'origem', 'entrada']):
+                        from_col = i
+                    elif any(keyword in col_lower for keyword in ['to', 'destino', 'saída', 'saida']):
+                        to_col = i
+                
+                if from_col is not None and to_col is not None:
+                    last_col = max(from_col, to_col)
+                    for row in rows:
+                        if len(row) <= last_col or row[from_col] is None or row[to_col] is None:
+                            continue
+                        from_curr = str(row[from_col]).strip().upper()
+                        to_curr = str(row[to_col]).strip().upper()
+                        if len(from_curr) == 3 and len(to_curr) == 3:
+                            pairs.append(CurrencyPair(from_curr, to_curr))
+            finally:
+                workbook.close()
             
             self.custom_logger.success(f"Carregados {len(pairs)} pares de moedas do Excel")
             return pairs if pairs else [CurrencyPair("USD", "BRL"), CurrencyPair("EUR", "BRL")]
@@ -159,41 +353,71 @@ class MoedasSpider(scrapy.Spider):
             self.custom_logger.error("Erro ao ler arquivo Excel", exception=e)
             return [CurrencyPair("USD", "BRL"), CurrencyPair("EUR", "BRL")]
 
-    def _get_rate_via_api(self, pair: CurrencyPair):
-        """Método alternativo usando API do BCB"""
+    def start_requests(self):
+        """Consulta a API do BCB para todos os pares suportados; os demais vão para a página de conversão"""
+        self.progress.start(self.operation_id, "Extração de Cotações", len(self.currency_pairs))
+        
+        api_date = self.target_date.strftime('%m-%d-%Y')
+        
+        # Uma consulta à API por moeda: pares repetidos compartilham a mesma resposta
+        api_pairs = collections.defaultdict(list)
+        for pair in self.currency_pairs:
+            if pair.from_currency in API_CURRENCIES and pair.to_currency == 'BRL':
+                api_pairs[pair.from_currency].append(pair)
+            else:
+                yield self._conversion_request(pair, time.perf_counter())
+        
+        for currency, pairs in api_pairs.items():
+            yield scrapy.Request(
+                url=API_URL.format(moeda=currency, data=api_date),
+                headers={'Accept': 'application/json'},
+                callback=self.parse_api,
+                errback=self.api_failed,
+                cb_kwargs={"pairs": pairs, "start_time": time.perf_counter()},
+                meta={'ptax_api': True},
+                dont_filter=True,
+            )
+
+    def parse_api(self, response, pairs: list, start_time: float):
+        """Processa a resposta JSON da API PTAX (uma moeda, um ou mais pares)"""
         try:
-            today = self.target_date.strftime('%m-%d-%Y')
-            
-            currency_codes = {
-                'USD': '1',
-                'EUR': '978',
-                'GBP': '826',
-                'JPY': '392',
-                'CAD': '124',
-                'AUD': '36',
-                'CHF': '756'
-            }
-            
-            # API
-            if pair.from_currency in currency_codes and pair.to_currency == 'BRL':
-                url = f"https://olinda.bcb.gov.br/olinda/servico/PTAX/versao/v1/odata/CotacaoMoedaDia(moeda=@moeda,dataCotacao=@dataCotacao)?@moeda='{pair.from_currency}'&@dataCotacao='{today}'&$top=1&$orderby=dataHoraCotacao%20desc&$format=json&$select=cotacaoCompra,cotacaoVenda,dataHoraCotacao"
-                
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('value') and len(data['value']) > 0:
-                        cotacao = data['value'][0]
-                        rate = float(cotacao.get('cotacaoVenda', 0))
-                        if rate > 0:
-                            self.custom_logger.debug(f"API BCB retornou cotação: {rate}")
-                            return rate, self.target_date, "Sucesso via API BCB"
-            
-            return 0.0, self.target_date, "API não disponível para este par"
-            
-        except Exception as e:
-            self.custom_logger.debug(f"Falha na API BCB: {str(e)}")
-            return 0.0, self.target_date, f"Erro na API: {str(e)}"
+            data = json.loads(response.body)
+            values = data.get('value') or []
+            rate = float(values[0].get('cotacaoVenda', 0)) if values else 0.0
+        except (ValueError, TypeError) as e:
+            self.custom_logger.debug(f"Resposta inválida da API BCB: {str(e)}")
+            rate = 0.0
+        
+        for pair in pairs:
+            if rate > 0:
+                self.custom_logger.debug(f"API BCB retornou cotação: {rate}")
+                yield self._make_result(pair, rate, self.target_date, "Sucesso via API BCB", start_time)
+            else:
+                # Sem cotação na API (ex.: fim de semana): tenta a página de conversão
+                yield self._conversion_request(pair, start_time)
+
+    def api_failed(self, failure):
+        """Falha de rede na API: o par é consultado pela página de conversão"""
+        kwargs = failure.request.cb_kwargs
+        self.custom_logger.debug(f"Falha na API BCB: {failure.getErrorMessage()}")
+        for pair in kwargs["pairs"]:
+            yield self._conversion_request(pair, kwargs["start_time"])
+
+    def _conversion_request(self, pair: CurrencyPair, start_time: float):
+        """Requisição HTML (sem navegador) da página de conversão para o par"""
+        return scrapy.FormRequest(
+            self.start_urls[0],
+            method="GET",
+            formdata={
+                "de": pair.from_currency,
+                "para": pair.to_currency,
+                "data": self.target_date.strftime('%d/%m/%Y'),
+            },
+            callback=self.parse,
+            errback=self.conversion_failed,
+            cb_kwargs={"pair": pair, "start_time": start_time},
+            dont_filter=True,
+        )
 
     def _setup_driver(self):
         """Configura WebDriver Chrome otimizado"""
@@ -201,6 +425,10 @@ class MoedasSpider(scrapy.Spider):
             return self.driver
             
         try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            
             self.custom_logger.info("Configurando navegador...")
             
             options = Options()
@@ -216,14 +444,46 @@ class MoedasSpider(scrapy.Spider):
             options.add_argument('--enable-javascript')
             options.add_argument('--log-level=3')
             options.add_argument('--silent')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            # Serviços em segundo plano do Chrome que só geram tráfego e CPU extras
+            options.add_argument('--disable-background-networking')
+            options.add_argument('--disable-sync')
+            options.add_argument('--disable-translate')
+            options.add_argument('--metrics-recording-only')
+            options.add_argument('--mute-audio')
             options.add_experimental_option('excludeSwitches', ['enable-logging'])
             options.add_experimental_option('useAutomationExtension', False)
             
-            service = Service(ChromeDriverManager().install())
+            # Não baixa imagens, fontes, plugins nem notificações: só o HTML/JS importa para a extração.
+            # O CSS continua habilitado porque as verificações de visibilidade (offsetParent) dependem dele.
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2,
+                'profile.managed_default_content_settings.fonts': 2,
+                'profile.managed_default_content_settings.plugins': 2,
+            })
+            
+            # driver.get retorna no DOMContentLoaded; as esperas explícitas cuidam do resto
+            options.page_load_strategy = 'eager'
+            
+            with MoedasSpider._DRIVER_PATH_LOCK:
+                if MoedasSpider._DRIVER_PATH is None:
+                    MoedasSpider._DRIVER_PATH = _chromedriver_path()
+            service = Service(MoedasSpider._DRIVER_PATH)
             driver = webdriver.Chrome(service=service, options=options)
             
             driver.set_page_load_timeout(45)
-            driver.implicitly_wait(10)
+
+            # Bloqueia analytics, fontes e imagens de terceiros em todas as navegações (via CDP)
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+            except Exception as e:
+                self.custom_logger.debug(f"Não foi possível bloquear requisições externas: {str(e)}")
+            
+            # Sem espera implícita: as esperas são todas explícitas (WebDriverWait),
+            # e buscas sem resultado retornam na hora
+            driver.implicitly_wait(0)
             
             self.driver = driver
             self.custom_logger.success("Navegador configurado com sucesso")
@@ -233,60 +493,138 @@ class MoedasSpider(scrapy.Spider):
             self.custom_logger.error("Erro ao configurar navegador", exception=e)
             raise
 
-    def parse(self, response):
-        """Processa todas as cotações"""
-        operation_id = "cotacao_extraction"
-        self.progress.start(operation_id, "Extração de Cotações", len(self.currency_pairs))
+    @property
+    def driver(self):
+        """WebDriver da thread atual"""
+        return getattr(self._local, "driver", None)
+
+    @driver.setter
+    def driver(self, driver):
+        self._local.driver = driver
+        self._local.form_ready = False
+        if driver is not None:
+            with self._drivers_lock:
+                self._drivers.append(driver)
+
+    async def parse(self, response, pair: CurrencyPair, start_time: float):
+        """Procura a cotação no HTML da página de conversão; sem resultado, usa o navegador"""
+        result_text = " ".join(response.xpath("//div[contains(@class, 'card-body')]//text()").getall())
+        rate_value = self._find_rate(result_text)
         
-        for i, pair in enumerate(self.currency_pairs):
-            self.custom_logger.info(f"Processando {pair.from_currency}/{pair.to_currency}")
-            
-            start_time = time.time()
-            
-            # Tenta web scraping primeiro
-            rate_value, actual_date, status = self._get_exchange_rate_hybrid(pair)
-            
-            # Fallback para API se necessário
-            if rate_value == 0.0 and "Erro" in status:
-                self.custom_logger.info("Tentando via API BCB...")
-                api_rate, api_date, api_status = self._get_rate_via_api(pair)
-                if api_rate > 0:
-                    rate_value, actual_date, status = api_rate, api_date, api_status
-            
-            execution_time = time.time() - start_time
-            
-            # Log do resultado
-            if "sucesso" in status.lower():
-                self.custom_logger.success(f"{pair.from_currency}/{pair.to_currency}: {rate_value:.6f} ({execution_time:.1f}s)")
-            elif "erro" in status.lower():
-                self.custom_logger.error(f"{pair.from_currency}/{pair.to_currency}: {status} ({execution_time:.1f}s)")
-                self.progress.add_error(operation_id)
+        if rate_value > 0:
+            actual_date = self._find_date(result_text)
+            yield self._make_result(pair, rate_value, actual_date, self._rate_status(rate_value, actual_date), start_time)
+        else:
+            yield await self._scrape_in_browser(pair, start_time)
+
+    async def conversion_failed(self, failure):
+        """Falha de rede na página de conversão: o par é consultado pelo navegador"""
+        kwargs = failure.request.cb_kwargs
+        self.custom_logger.debug(f"Falha ao carregar a página de conversão: {failure.getErrorMessage()}")
+        yield await self._scrape_in_browser(kwargs["pair"], kwargs["start_time"])
+
+    def _scrape_in_browser(self, pair: CurrencyPair, start_time: float):
+        """Consulta o par pelo navegador num worker do pool, sem bloquear o reactor do Scrapy"""
+        from twisted.internet import defer, reactor
+        
+        deferred = defer.Deferred()
+        
+        def done(future):
+            if future.exception() is not None:
+                reactor.callFromThread(deferred.errback, future.exception())
             else:
-                self.custom_logger.warning(f"{pair.from_currency}/{pair.to_currency}: {status} ({execution_time:.1f}s)")
-                self.progress.add_warning(operation_id)
-            
-            exchange_rate = ExchangeRate(
-                from_currency=pair.from_currency,
-                to_currency=pair.to_currency,
-                rate_value=rate_value,
-                rate_date=actual_date,
-                status=status,
-                execution_time=execution_time
-            )
-            
-            self.results.append(exchange_rate)
-            self.progress.update(operation_id)
-            yield exchange_rate.to_dict()
+                reactor.callFromThread(deferred.callback, future.result())
+        
+        self._executor.submit(self._scrape_pair, pair, start_time).add_done_callback(done)
+        return maybe_deferred_to_future(deferred)
+
+    def _scrape_pair(self, pair: CurrencyPair, start_time: float = None):
+        """Obtém a cotação de um par pela página de conversão"""
+        self.custom_logger.info(f"Processando {pair.from_currency}/{pair.to_currency}")
+        
+        if start_time is None:
+            start_time = time.perf_counter()
+        
+        cached = self._get_cached_rate(pair)
+        if cached:
+            rate_value, actual_date, status = cached
+        else:
+            rate_value, actual_date, status = self._get_exchange_rate_hybrid(pair)
+            if rate_value > 0:
+                self._set_cached_rate(pair, rate_value, actual_date, status)
+        
+        return self._make_result(pair, rate_value, actual_date, status, start_time)
+
+    def _cache_key(self, pair: CurrencyPair) -> str:
+        return f"{pair.from_currency}|{pair.to_currency}|{self.target_date.isoformat()}"
+
+    def _get_cached_rate(self, pair: CurrencyPair):
+        """Retorna (cotação, data, status) do cache se ainda estiver válida"""
+        ttl = CACHE_TTL_TODAY if self.target_date == date.today() else CACHE_TTL_PAST
+        try:
+            with self._cache_lock:
+                entry = self._cache.get(self._cache_key(pair))
+        except Exception as e:
+            self.custom_logger.debug(f"Erro ao ler cache: {str(e)}")
+            return None
+        
+        if not entry or entry['ts'] <= time.time() - ttl:
+            return None
+        
+        self.custom_logger.debug(f"Cotação {pair.from_currency}/{pair.to_currency} obtida do cache")
+        return entry['rate'], date.fromisoformat(entry['date']), entry['status']
+
+    def _set_cached_rate(self, pair: CurrencyPair, rate_value: float, actual_date: date, status: str):
+        """Guarda uma cotação válida no cache (falhas nunca são guardadas)"""
+        try:
+            with self._cache_lock:
+                self._cache[self._cache_key(pair)] = {
+                    'rate': rate_value,
+                    'date': actual_date.isoformat(),
+                    'status': status,
+                    'ts': time.time(),
+                }
+        except Exception as e:
+            self.custom_logger.debug(f"Erro ao gravar cache: {str(e)}")
+
+    def _make_result(self, pair: CurrencyPair, rate_value: float, actual_date: date, status: str, start_time: float):
+        """Registra o resultado de um par e retorna o item a ser emitido"""
+        execution_time = time.perf_counter() - start_time
         
-        self.progress.finish(operation_id)
-        self._save_results()
+        # Log do resultado
+        status_lower = status.lower()
+        if "sucesso" in status_lower:
+            status_key = 'ok'
+            self.custom_logger.success(f"{pair.from_currency}/{pair.to_currency}: {rate_value:.6f} ({execution_time:.1f}s)")
+        elif "erro" in status_lower:
+            status_key = 'err'
+            self.custom_logger.error(f"{pair.from_currency}/{pair.to_currency}: {status} ({execution_time:.1f}s)")
+            self.progress.add_error(self.operation_id)
+        else:
+            status_key = 'warn'
+            self.custom_logger.warning(f"{pair.from_currency}/{pair.to_currency}: {status} ({execution_time:.1f}s)")
+            self.progress.add_warning(self.operation_id)
+        
+        # Os resultados chegam também das threads de consulta
+        with self._counts_lock:
+            self._status_counts[status_key] += 1
+            self._total_time += execution_time
+        
+        self.progress.update(self.operation_id)
+        return ExchangeRateItem(
+            moeda_entrada=pair.from_currency,
+            moeda_saida=pair.to_currency,
+            valor_cotacao=rate_value,
+            data=actual_date,
+            status=status,
+            tempo_s=execution_time
+        )
 
     def _get_exchange_rate_hybrid(self, pair: CurrencyPair):
         """Método híbrido com múltiplas estratégias"""
         strategies = [
             ("Formulário Web", self._strategy_form_submission),
             ("Navegação Direta", self._strategy_direct_navigation),
-            ("JavaScript Injection", self._strategy_javascript_injection)
         ]
         
         for strategy_name, strategy_func in strategies:
@@ -304,18 +642,28 @@ class MoedasSpider(scrapy.Spider):
 
     def _strategy_form_submission(self, pair: CurrencyPair):
         """Estratégia 1: Submissão de formulário padrão"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         if not self.driver:
             self._setup_driver()
         
         try:
-            self.driver.get("https://www.bcb.gov.br/conversao")
-            
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(3)
-            
-            self._close_cookie_banner()
+            # A página é carregada uma vez por navegador; os pares seguintes reaproveitam o formulário
+            previous_text = ""
+            if getattr(self._local, "form_ready", False):
+                previous_text = self.driver.execute_script(_RESULT_TEXT_JS) or ""
+            else:
+                self.driver.get("https://www.bcb.gov.br/conversao")
+                
+                # Espera o formulário ficar disponível em vez de uma pausa fixa
+                WebDriverWait(self.driver, 20).until(
+                    EC.presence_of_element_located((By.ID, "button-converter-de"))
+                )
+                
+                self._close_cookie_banner()
+                self._local.form_ready = True
             
             date_str = self.target_date.strftime('%d/%m/%Y')
             
@@ -337,6 +685,21 @@ class MoedasSpider(scrapy.Spider):
                 }});
             }}
             
+            function waitFor(fn, timeout = 5000) {{
+                return new Promise(resolve => {{
+                    const startTime = Date.now();
+                    const check = () => {{
+                        const result = fn();
+                        if (result || Date.now() - startTime > timeout) {{
+                            resolve(result);
+                        }} else {{
+                            setTimeout(check, 100);
+                        }}
+                    }};
+                    check();
+                }});
+            }}
+            
             function findElementByText(text) {{
                 const xpath = `//a[contains(text(), '${{text}}')]`;
                 const result = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
@@ -349,28 +712,21 @@ class MoedasSpider(scrapy.Spider):
                     
                     const btnDe = document.getElementById('button-converter-de');
                     btnDe.click();
-                    await new Promise(resolve => setTimeout(resolve, 1000));
                     
-                    let usdOption = findElementByText('{pair.from_currency}');
-                    if (!usdOption) {{
-                        usdOption = document.querySelector(`[data-value="{pair.from_currency}"]`);
-                    }}
+                    // Espera o menu abrir em vez de uma pausa fixa
+                    const usdOption = await waitFor(() =>
+                        findElementByText('{pair.from_currency}') ||
+                        document.querySelector(`[data-value="{pair.from_currency}"]`));
                     if (usdOption) usdOption.click();
                     
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    
                     const btnPara = document.getElementById('button-converter-para');
                     btnPara.click();
-                    await new Promise(resolve => setTimeout(resolve, 1000));
                     
-                    let brlOption = findElementByText('{pair.to_currency}');
-                    if (!brlOption) {{
-                        brlOption = document.querySelector(`[data-value="{pair.to_currency}"]`);
-                    }}
+                    const brlOption = await waitFor(() =>
+                        findElementByText('{pair.to_currency}') ||
+                        document.querySelector(`[data-value="{pair.to_currency}"]`));
                     if (brlOption) brlOption.click();
                     
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    
                     const dateInputs = document.querySelectorAll('input[placeholder*="DD"], input[type="date"], input[name*="data"]');
                     for (let dateInput of dateInputs) {{
                         if (dateInput.offsetParent !== null) {{
@@ -380,8 +736,6 @@ class MoedasSpider(scrapy.Spider):
                         }}
                     }}
                     
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    
                     const convertBtns = document.querySelectorAll('button, input[type="submit"]');
                     for (let btn of convertBtns) {{
                         if (btn.textContent.includes('Converter') || btn.value.includes('Converter')) {{
@@ -407,10 +761,12 @@ class MoedasSpider(scrapy.Spider):
             result = self.driver.execute_script(js_script)
             self.custom_logger.debug(f"JavaScript execution result: {result}")
             
-            time.sleep(10)
+            self._wait_for_result(previous_text)
             return self._extract_result_advanced(pair)
             
         except Exception as e:
+            # Estado da página desconhecido: o próximo par recarrega o formulário
+            self._local.form_ready = False
             raise Exception(f"Strategy 1 failed: {str(e)}")
 
     def _strategy_direct_navigation(self, pair: CurrencyPair):
@@ -422,84 +778,20 @@ class MoedasSpider(scrapy.Spider):
             if not self.driver:
                 self._setup_driver()
             
-            self.driver.get(url)
-            time.sleep(5)
+            self._local.form_ready = False
+            # A mesma consulta já carregada (ex.: repetição do par) dispensa recarregar a página
+            if self.driver.current_url != url:
+                self.driver.get(url)
+            self._wait_for_result()
             
             return self._extract_result_advanced(pair)
             
         except Exception as e:
             raise Exception(f"Strategy 2 failed: {str(e)}")
 
-    def _strategy_javascript_injection(self, pair: CurrencyPair):
-        """Estratégia 3: JavaScript injection"""
-        try:
-            if not self.driver:
-                self._setup_driver()
-            
-            self.driver.get("https://www.bcb.gov.br/conversao")
-            time.sleep(3)
-            
-            js_code = f"""
-            function simulateConversion() {{
-                if (window.fetch) {{
-                    const data = {{
-                        from: '{pair.from_currency}',
-                        to: '{pair.to_currency}',
-                        date: '{self.target_date.strftime('%Y-%m-%d')}'
-                    }};
-                    
-                    const possibleEndpoints = [
-                        '/api/conversao',
-                        '/conversao/api',
-                        '/ptax/api'
-                    ];
-                    
-                    for (let endpoint of possibleEndpoints) {{
-                        try {{
-                            fetch(endpoint, {{
-                                method: 'POST',
-                                headers: {{'Content-Type': 'application/json'}},
-                                body: JSON.stringify(data)
-                            }})
-                            .then(response => response.json())
-                            .then(data => {{
-                                if (data.rate || data.valor || data.cotacao) {{
-                                    const rate = data.rate || data.valor || data.cotacao;
-                                    document.body.setAttribute('data-rate', rate);
-                                }}
-                            }});
-                        }} catch (e) {{
-                            console.log('Endpoint failed:', endpoint);
-                        }}
-                    }}
-                }}
-                
-                return 'JavaScript injection completed';
-            }}
-            
-            return simulateConversion();
-            """
-            
-            self.driver.execute_script(js_code)
-            time.sleep(5)
-            
-            try:
-                rate_value = self.driver.execute_script("return document.body.getAttribute('data-rate');")
-                if rate_value:
-                    return float(rate_value), self.target_date, "Sucesso via JavaScript"
-            except:
-                pass
-            
-            return self._extract_result_advanced(pair)
-            
-        except Exception as e:
-            raise Exception(f"Strategy 3 failed: {str(e)}")
-
     def _close_cookie_banner(self):
         """Fecha banner de cookies"""
         try:
-            time.sleep(1)
-            
             js_close = """
             const closeButtons = [
                 ...document.querySelectorAll('button'),
@@ -527,161 +819,173 @@ class MoedasSpider(scrapy.Spider):
             """
             
             self.driver.execute_script(js_close)
-            time.sleep(1)
             
         except:
             pass
 
+    def _wait_for_result(self, previous_text: str = "", timeout: int = 15):
+        """
+        Espera o resultado da conversão aparecer; se não aparecer, a extração segue assim mesmo
+        
+        Quando o formulário é reaproveitado, previous_text é o resultado do par anterior
+        e a espera só termina quando ele for substituído.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.find_elements(By.XPATH, "//*[contains(text(), 'Resultado')]")
+                and driver.execute_script(_RESULT_TEXT_JS) != previous_text
+            )
+        except TimeoutException:
+            self.custom_logger.debug("Resultado da conversão não apareceu no tempo esperado")
+
+    @staticmethod
+    def _matching_result_text(driver, keywords):
+        """Retorna o texto do resultado se já contém alguma das palavras esperadas"""
+        return driver.execute_script(_MATCHING_RESULT_TEXT_JS, list(keywords)) or False
+
+    @staticmethod
+    def _find_rate(text: str) -> float:
+        """Procura a cotação no texto usando os padrões conhecidos (na ordem de prioridade)"""
+        # Páginas de erro/vazias não têm número decimal algum
+        if not _DECIMAL_HINT.search(text):
+            return 0.0
+        
+        rate_value = 0.0
+        
+        for pattern in _RATE_PATTERNS:
+            matches = pattern.findall(text)
+            for match in matches:
+                try:
+                    clean_value = _NON_NUMERIC.sub('', match)
+                    clean_value = clean_value.replace(',', '.')
+                    
+                    potential_value = float(clean_value)
+                    
+                    if 3.0 <= potential_value <= 10.0:
+                        rate_value = potential_value
+                        break
+                    elif 0.1 <= potential_value <= 50.0:
+                        rate_value = potential_value
+                        
+                except (ValueError, TypeError):
+                    continue
+            
+            if rate_value > 0:
+                break
+        
+        return rate_value
+
+    @staticmethod
+    def _data_rate_value(elements) -> float:
+        """Lê a cotação do primeiro atributo data-rate numérico, ou 0.0 se não houver"""
+        for element in elements:
+            try:
+                return float(_NON_NUMERIC.sub('', element.get_attribute('data-rate') or '').replace(',', '.'))
+            except ValueError:
+                continue
+        return 0.0
+
+    def _find_date(self, text: str) -> date:
+        """Procura no texto a data da cotação (até 7 dias da data alvo)"""
+        for date_pattern in _DATE_PATTERNS:
+            for date_str in date_pattern.findall(text):
+                try:
+                    if date_str[4] == '-':
+                        parsed_date = date.fromisoformat(date_str)
+                    else:
+                        parsed_date = _parse_ddmmyyyy(date_str)
+                    
+                    if abs((parsed_date - self.target_date).days) <= 7:
+                        return parsed_date
+                except:
+                    continue
+        
+        return self.target_date
+
+    def _rate_status(self, rate_value: float, actual_date: date) -> str:
+        """Status do resultado conforme o valor e a data encontrados"""
+        if rate_value <= 0:
+            return "Valor não encontrado"
+        if actual_date != self.target_date:
+            return "Sucesso com data diferente"
+        return "Sucesso"
+
     def _extract_result_advanced(self, pair: CurrencyPair):
         """Extração avançada de resultados"""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         try:
-            WebDriverWait(self.driver, 30).until(
-                lambda driver: any([
-                    "resultado" in driver.page_source.lower(),
-                    "cotação" in driver.page_source.lower(),
-                    "real" in driver.page_source.lower(),
-                    "brl" in driver.page_source.lower(),
-                    pair.from_currency.lower() in driver.page_source.lower()
-                ])
+            # Atalho: se a página expõe a cotação num atributo data-rate, dispensa a leitura do texto
+            rate_value = self._data_rate_value(self.driver.find_elements(By.CSS_SELECTOR, '[data-rate]'))
+            if rate_value > 0:
+                return rate_value, self.target_date, self._rate_status(rate_value, self.target_date)
+            
+            keywords = ("resultado", "cotação", "real", "brl", pair.from_currency.lower())
+            
+            # Lê só o texto do resultado, em vez de serializar o DOM inteiro a cada verificação
+            result_text = WebDriverWait(self.driver, 30, poll_frequency=0.2).until(
+                lambda driver: self._matching_result_text(driver, keywords)
             )
             
-            page_source = self.driver.page_source
-            
-            patterns = [
-                r'1\s*USD\s*=\s*R\$?\s*([0-9]+[.,][0-9]+)',
-                r'1\s*Dólar.*?([0-9]+[.,][0-9]+).*?Real',
-                r'USD.*?([0-9]+[.,][0-9]{4,6}).*?BRL',
-                r'Resultado.*?([0-9]+[.,][0-9]+)',
-                r'Valor.*?([0-9]+[.,][0-9]+)',
-                r'Cotação.*?([0-9]+[.,][0-9]+)',
-                r'([4-8][.,][0-9]{4,6})',
-                r'([0-9]{1,2}[.,][0-9]{4,6})',
-                r'content="([0-9]+[.,][0-9]+)"',
-                r'value="([0-9]+[.,][0-9]+)"',
-                r'data-rate="([0-9]+[.,][0-9]+)"'
-            ]
-            
-            rate_value = 0.0
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, page_source, re.IGNORECASE | re.DOTALL)
-                for match in matches:
-                    try:
-                        clean_value = re.sub(r'[^\d.,]', '', match)
-                        clean_value = clean_value.replace(',', '.')
-                        
-                        potential_value = float(clean_value)
-                        
-                        if 3.0 <= potential_value <= 10.0:
-                            rate_value = potential_value
-                            break
-                        elif 0.1 <= potential_value <= 50.0:
-                            rate_value = potential_value
-                            
-                    except (ValueError, TypeError):
-                        continue
-                
-                if rate_value > 0:
-                    break
-            
-            # Busca data
-            actual_date = self.target_date
-            date_patterns = [
-                r'(\d{2}/\d{2}/\d{4})',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{2}-\d{2}-\d{4})'
-            ]
-            
-            for date_pattern in date_patterns:
-                date_matches = re.findall(date_pattern, page_source)
-                for date_str in date_matches:
-                    try:
-                        if '/' in date_str:
-                            parsed_date = datetime.strptime(date_str, "%d/%m/%Y").date()
-                        elif '-' in date_str and len(date_str) == 10:
-                            parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                        else:
-                            parsed_date = datetime.strptime(date_str, "%d-%m-%Y").date()
-                        
-                        if abs((parsed_date - self.target_date).days) <= 7:
-                            actual_date = parsed_date
-                            break
-                    except:
-                        continue
-                if actual_date != self.target_date:
-                    break
+            rate_value = self._find_rate(result_text)
             
-            if rate_value > 0:
-                if actual_date != self.target_date:
-                    status = "Sucesso com data diferente"
-                else:
-                    status = "Sucesso"
-            else:
-                status = "Valor não encontrado"
+            # Os padrões de atributos (content=, value=, data-rate=) só existem no HTML;
+            # em último caso, lê só esses atributos em vez de serializar o DOM inteiro
+            if rate_value == 0.0:
+                rate_value = self._find_rate(self.driver.execute_script(_RATE_ATTRIBUTES_JS) or '')
             
-            return rate_value, actual_date, status
+            actual_date = self._find_date(result_text)
+            return rate_value, actual_date, self._rate_status(rate_value, actual_date)
             
         except TimeoutException:
             return 0.0, self.target_date, "Erro: Timeout na extração"
         except Exception as e:
             return 0.0, self.target_date, f"Erro na extração: {str(e)}"
 
-    def _save_results(self):
-        """Salva resultados com relatórios profissionais"""
-        if not self.results:
-            self.custom_logger.error("Nenhum resultado para salvar")
+    def _report_results(self):
+        """Relatório final (os arquivos já foram gravados pelos feed exporters)"""
+        total = sum(self._status_counts.values())
+        if not total:
+            self.custom_logger.error("Nenhum resultado obtido")
             return
         
-        self.custom_logger.info("Salvando resultados...")
-        
-        df = pd.DataFrame([result.to_dict() for result in self.results])
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Salva arquivos
-        files = {
-            f"cotacoes_{timestamp}.xlsx": lambda: df.to_excel(self.output_dir / f"cotacoes_{timestamp}.xlsx", index=False),
-            f"cotacoes_{timestamp}.csv": lambda: df.to_csv(self.output_dir / f"cotacoes_{timestamp}.csv", index=False, encoding='utf-8-sig'),
-            "cotacoes_latest.json": lambda: df.to_json(self.output_dir / "cotacoes_latest.json", orient='records', indent=2, force_ascii=False)
-        }
-        
-        saved_files = []
-        for filename, save_func in files.items():
-            try:
-                save_func()
-                saved_files.append(filename)
-            except Exception as e:
-                self.custom_logger.error(f"Erro ao salvar {filename}", exception=e)
-        
         # Estatísticas finais
-        success_count = sum(1 for r in self.results if "sucesso" in r.status.lower())
-        error_count = sum(1 for r in self.results if "erro" in r.status.lower())
-        warning_count = len(self.results) - success_count - error_count
+        success_count = self._status_counts['ok']
+        error_count = self._status_counts['err']
+        warning_count = self._status_counts['warn']
         
-        total_time = sum(r.execution_time for r in self.results)
-        success_rate = (success_count / len(self.results)) * 100 if self.results else 0
+        total_time = self._total_time
+        success_rate = (success_count / total) * 100
         
         # Relatório final
         self.custom_logger.info("=== RELATÓRIO FINAL ===")
-        self.custom_logger.info(f"Total processado: {len(self.results)} pares")
+        self.custom_logger.info(f"Total processado: {total} pares")
         self.custom_logger.success(f"Sucessos: {success_count} ({success_rate:.1f}%)")
         if warning_count > 0:
             self.custom_logger.warning(f"Avisos: {warning_count}")
         if error_count > 0:
             self.custom_logger.error(f"Erros: {error_count}")
         self.custom_logger.info(f"Tempo total: {total_time:.1f}s")
-        self.custom_logger.info(f"Arquivos salvos: {len(saved_files)}")
         self.custom_logger.info(f"Local: {self.output_dir.absolute()}")
-        
-        # Cotações obtidas
-        for result in self.results:
-            if result.rate_value > 0:
-                self.custom_logger.success(f"Cotação {result.from_currency}/{result.to_currency}: {result.rate_value:.6f}")
 
     def closed(self, reason):
-        """Limpa recursos"""
-        if self.driver:
+        """Exibe o relatório final e limpa recursos"""
+        self.progress.finish(self.operation_id)
+        self._report_results()
+        
+        self._executor.shutdown(wait=True)
+        
+        for driver in self._drivers:
             try:
-                self.driver.quit()
+                driver.quit()
             except:
                 pass
+        self._drivers.clear()
+        self._cache.close()
         self.custom_logger.info("Processo finalizado com sucesso")
\ No newline at end of file
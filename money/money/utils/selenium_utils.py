@@ -2,26 +2,64 @@
 import os
 import time
 import logging
+import numpy as np
 import pandas as pd
 import sys
 import io
-import random
 import uuid
 import re
 import traceback
 import hashlib
+import functools
+import shutil
+import shelve
+import struct
 import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Iterator, Tuple, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+# webdriver-manager lê as variáveis na importação: drivers no diretório do projeto e sem logs próprios
+os.environ.setdefault("WDM_LOCAL", "1")
+os.environ.setdefault("WDM_LOG_LEVEL", "0")
 from webdriver_manager.chrome import ChromeDriverManager
 from dataclasses import dataclass
 
+from ..config import BASE_DIR, INPUT_DIR, LOGS_DIR, OUTPUT_DIR, SCREENSHOTS_DIR, queued_handler
+from ..repository import (
+    create_sample_currency_file,
+    load_currency_pairs,
+    save_records_to_excel,
+    save_to_parquet,
+)
+
+# Diretório deste módulo, onde também é deixada uma cópia do relatório Excel
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Caminho do chromedriver resolvido pelo webdriver-manager, reaproveitado entre execuções por até um dia
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "bcb_spider", "chromedriver")
+DRIVER_PATH_TTL = 86400
+
+# Cache em disco das cotações já obtidas: as do dia expiram, as de datas passadas não mudam mais
+RATE_CACHE_FILE = os.path.join(BASE_DIR, "assets", "cache", "rates")
+RATE_CACHE_TTL_TODAY = 300
+
+# Espera máxima (segundos) entre consultas quando o site indica bloqueio por excesso de requisições
+BLOCK_BACKOFF_MAX = 30.0
+
 # Salva os streams originais antes de qualquer redirecionamento
 _original_stdout = sys.stdout
 _original_stderr = sys.stderr
@@ -69,41 +107,260 @@ def setup_safe_streams():
 setup_safe_streams()
 
 # Configuração de logging formatada
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(
-    log_dir, f"currency_automation_{date.today().strftime('%Y%m%d')}.log")
-
-# Formato simplificado para os logs principais
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+    LOGS_DIR, f"currency_automation_{date.today().strftime('%Y%m%d')}.log")
+
+# Formato simplificado para os logs principais; a escrita em arquivo/console fica
+# numa thread separada (mesma fila de config.setup_logging), e só é configurada
+# se o logging ainda não tiver sido configurado por lá
+root_logger = logging.getLogger()
+if not root_logger.handlers:
+    log_formatter = logging.Formatter(
+        "[%(asctime)s] [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(log_formatter)
+    root_logger.addHandler(queued_handler(file_handler, stream_handler))
+    root_logger.setLevel(logging.INFO)
 
 # Logger principal
 logger = logging.getLogger("currency_automation")
 
-# Logger separado para logs detalhados/técnicos
+# Logger separado para logs detalhados/técnicos (um único arquivo de debug por dia)
 debug_logger = logging.getLogger("debug_logger")
-debug_log_file = os.path.join(
-    log_dir, f"debug_{date.today().strftime('%Y%m%d')}.log")
-debug_handler = logging.FileHandler(debug_log_file, encoding='utf-8')
-debug_handler.setFormatter(logging.Formatter(
-    "[%(asctime)s] %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
-    datefmt="%d/%m/%Y %H:%M:%S"
-))
-debug_logger.addHandler(debug_handler)
+if not debug_logger.handlers:
+    debug_log_file = os.path.join(
+        LOGS_DIR, f"debug_{date.today().strftime('%Y%m%d')}.log")
+    debug_handler = logging.FileHandler(debug_log_file, encoding='utf-8')
+    debug_handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
+        datefmt="%d/%m/%Y %H:%M:%S"
+    ))
+    debug_logger.addHandler(queued_handler(debug_handler))
 debug_logger.setLevel(logging.DEBUG)
 
+# Recursos de terceiros que não influenciam a cotação e são bloqueados no navegador
+BLOCKED_URLS = [
+    "*google-analytics*", "*googletagmanager*", "*fonts.googleapis*", "*fonts.gstatic*",
+    "*doubleclick*", "*facebook*", "*.png", "*.jpg", "*.svg", "*.woff*",
+]
+
+# Padrões usados na extração do resultado, compilados uma única vez
+_CONVERSION_RESULT_RE = re.compile(r'Resultado da conversão:?\s*([\d,.]+)')
+_RATE_LINE_RE = re.compile(r'1\s+[\w/()]+\s+=\s+([\d,.]+)')
+_QUOTE_DATE_RE = re.compile(r'Data cotação utilizada:?\s*(\d{2}/\d{2}/\d{4})')
+_NUMBER_RE = re.compile(r'(\d+[,.]\d+)')
+_DATE_RE = re.compile(r'(\d{2}/\d{2}/\d{4})')
+# Sinais de página de bloqueio/limite de requisições
+_BLOCKED_PAGE_RE = re.compile(
+    r'too many requests|acesso negado|access denied|request rejected', re.IGNORECASE)
+
+# Padrões específicos do BCB para a taxa, na ordem em que são tentados
+_RATE_PATTERNS = (_CONVERSION_RESULT_RE, _RATE_LINE_RE)
+
+# XPaths dos itens do dropdown de moedas, preenchidos com o id do menu e a moeda em cada seleção
+_CURRENCY_ITEM_XPATHS = (
+    "//ul[@id='{menu_id}']//a[contains(text(), '{currency}')]",
+    "//div[contains(@class, 'dropdown-menu')]//a[contains(text(), '{currency}')]",
+    "//a[contains(@class, 'dropdown-item')][contains(text(), '{currency}')]",
+)
+_CURRENCY_ITEM_FALLBACK_XPATH = "//a[contains(@class, 'dropdown-item')][contains(., '{currency}')]"
+
+# Remove o separador de milhar e troca a vírgula decimal por ponto
+_BRL_NUMBER_TABLE = str.maketrans({".": None, ",": "."})
+
+# Número sem vírgula cujos pontos só separam milhares (1.234, 12.345.678)
+_THOUSANDS_ONLY_RE = re.compile(r'[1-9]\d{0,2}(?:\.\d{3})+')
+
+# Faixa de valores aceitos como taxa de câmbio nos padrões específicos do BCB
+_MIN_PLAUSIBLE_RATE = 0.01
+_MAX_PLAUSIBLE_RATE = 1000
+
+
+def _parse_ddmmyyyy(value: str) -> date:
+    """Converte uma data DD/MM/AAAA sem passar pelo strptime (o formato é sempre o mesmo)"""
+    return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+
+# Diretórios já criados neste processo (evita repetir o makedirs a cada chamada)
+_ensured_dirs = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """Cria o diretório (e os pais) apenas na primeira vez que é pedido no processo"""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+@functools.lru_cache(maxsize=64)
+def _format_ddmmyyyy(value: date) -> str:
+    """Formata a data como DD/MM/AAAA; as cotações de um lote têm poucas datas distintas"""
+    return value.strftime("%d/%m/%Y")
+
+
+def _parse_brl_number(value: str) -> float:
+    """Converte um número no formato brasileiro (1.234,5678) para float"""
+    if "," in value:
+        return float(value.translate(_BRL_NUMBER_TABLE))
+    if _THOUSANDS_ONLY_RE.fullmatch(value):
+        return float(value.replace(".", ""))
+    return float(value)
+
+
+def _is_plausible_rate(value: float) -> bool:
+    """Indica se o valor está na faixa esperada para uma taxa de câmbio"""
+    return _MIN_PLAUSIBLE_RATE <= value <= _MAX_PLAUSIBLE_RATE
+
+
+# Define findResultCard(): o card (div.card-body) que já traz um resultado de conversão,
+# ou null; o card do formulário também é um div.card-body e precisa ser ignorado
+_FIND_RESULT_CARD_JS = """
+const findResultCard = () => {
+    const isResult = /Resultado da conversão|1\\s+\\S+\\s+=\\s+[\\d.,]+/i;
+    for (const card of document.querySelectorAll('div.card-body')) {
+        if (isResult.test(card.innerText)) return card;
+    }
+    return null;
+};
+"""
+
+# Texto do card de resultado, só quando já traz um resultado de conversão; o teste roda no navegador
+_RESULT_CONTAINER_TEXT_JS = _FIND_RESULT_CARD_JS + """
+const card = findResultCard();
+return card ? card.innerText.trim() : '';
+"""
+
+# Avalia a lista de XPaths no navegador, numa única chamada, e retorna o primeiro elemento visível
+_FIRST_VISIBLE_JS = """
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+for (const xpath of arguments[0]) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) return el;
+    }
+}
+return null;
+"""
+
+# Clica no primeiro elemento visível entre os XPaths, numa única chamada; retorna se clicou
+_CLICK_FIRST_VISIBLE_JS = """
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+for (const xpath of arguments[0]) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) { el.click(); return true; }
+    }
+}
+return false;
+"""
+
+# Clica no elemento com o id arguments[0], se já existir; retorna se clicou
+_CLICK_BY_ID_JS = """
+const el = document.getElementById(arguments[0]);
+if (!el) return false;
+el.scrollIntoView({block: 'center'});
+el.click();
+return true;
+"""
+
+# Preenche o primeiro input visível entre os XPaths com arguments[1] e dispara os eventos
+# que a validação do formulário escuta, numa única chamada; retorna se encontrou o campo
+_FILL_FIRST_VISIBLE_JS = """
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+for (const xpath of arguments[0]) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) {
+            el.focus();
+            el.value = arguments[1];
+            for (const name of ['input', 'change', 'blur']) {
+                el.dispatchEvent(new Event(name, { bubbles: true }));
+            }
+            return true;
+        }
+    }
+}
+return false;
+"""
+
+# Fecha o banner de cookies: clica no primeiro botão visível entre os XPaths e retorna 'clicked',
+# ou null para continuar esperando (o banner é renderizado pelo Angular depois do carregamento)
+_DISMISS_BANNER_JS = """
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+for (const xpath of arguments[0]) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) { el.click(); return 'clicked'; }
+    }
+}
+return null;
+"""
+
+# Lê numa única chamada o texto do resultado e, se arguments[0] for verdadeiro, os textos
+# dos seletores alternativos de taxa e de data (um array por seletor), com querySelectorAll
+_RESULT_TEXTS_JS = _FIND_RESULT_CARD_JS + """
+const textOf = node => (node.nodeType === Node.ELEMENT_NODE ? node.innerText : node.textContent) || '';
+const card = findResultCard();
+// Os seletores alternativos são consultados só dentro do card de resultado, quando existe
+const root = card || document;
+const withText = (selector, text) =>
+    [...root.querySelectorAll(selector)].filter(el => el.textContent.includes(text));
+const parentText = el => el.parentElement ? textOf(el.parentElement) : '';
+const followingTexts = el => {
+    const texts = [];
+    for (let node = el.nextSibling; node; node = node.nextSibling) {
+        if (node.nodeType === Node.TEXT_NODE) texts.push(node.textContent);
+    }
+    return texts;
+};
+const ownTextIncludes = (el, text) =>
+    [...el.childNodes].some(node => node.nodeType === Node.TEXT_NODE && node.textContent.includes(text));
+const text = card ? card.innerText : (document.body ? document.body.innerText : '');
+if (!arguments[0]) return {text: text};
+const resultLabels = withText('strong', 'Resultado da conversão');
+return {
+    text: text,
+    rate_texts: [
+        resultLabels.flatMap(followingTexts),
+        resultLabels.map(parentText),
+        // O título h3 pode ficar fora do card (no cabeçalho), então é buscado no documento
+        [...document.querySelectorAll('h3')]
+            .filter(el => el.textContent.includes('Resultado da conversão')).map(parentText),
+        [...(card ? card.querySelectorAll('strong:nth-of-type(2)') : [])].map(textOf)
+    ],
+    date_texts: [
+        withText('strong', 'Data cotação').map(parentText),
+        [...root.querySelectorAll('div')].filter(el => ownTextIncludes(el, 'Data')).map(textOf)
+    ]
+};
+"""
+
+# Clica em todos os elementos visíveis encontrados pelos XPaths, numa única chamada
+_CLICK_ALL_VISIBLE_JS = """
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+let clicked = 0;
+for (const xpath of arguments[0]) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const el = found.snapshotItem(i);
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) { el.click(); clicked++; }
+    }
+}
+return clicked;
+"""
+
 # Classes para representação dos dados
-@dataclass
+@dataclass(frozen=True)
 class CurrencyPair:
     """Representa um par de moedas para conversão"""
+    __slots__ = ("from_currency", "to_currency")
+
     from_currency: str
     to_currency: str
 
@@ -111,26 +368,72 @@ class CurrencyPair:
         return f"{self.from_currency} para {self.to_currency}"
 
 
-@dataclass
+# Colunas da exportação de cotações, na ordem de ExchangeRate.to_record
+EXCHANGE_RATE_COLUMNS = ["Moeda entrada", "Taxa", "Moeda saída", "Valor cotação", "Data", "Status"]
+
+
+@dataclass(frozen=True)
 class ExchangeRate:
     """Representa uma cotação de moeda"""
+    # __slots__ declarado à mão (dataclass(slots=True) exige Python 3.10); por isso
+    # execution_time não tem valor padrão e é sempre informado
+    __slots__ = ("from_currency", "to_currency", "rate_value", "rate_date", "status", "execution_time")
+
     from_currency: str
     to_currency: str
     rate_value: float
     rate_date: date
     status: str
-    execution_time: Optional[float] = None
+    execution_time: Optional[float]
+
+    @classmethod
+    def error(cls, currency_pair: CurrencyPair, rate_date: date, error: Exception,
+              execution_time: Optional[float] = None) -> "ExchangeRate":
+        """Registro de erro (valor 0.0) para um par cuja consulta falhou"""
+        return cls(
+            from_currency=currency_pair.from_currency,
+            to_currency=currency_pair.to_currency,
+            rate_value=0.0,
+            rate_date=rate_date,
+            status=f"Erro: {str(error)}",
+            execution_time=execution_time
+        )
+
+    def to_record(self) -> tuple:
+        """Converte para tupla na ordem de EXCHANGE_RATE_COLUMNS"""
+        return (
+            self.from_currency,
+            1,
+            self.to_currency,
+            round(self.rate_value, 3) if self.rate_value else 0,
+            _format_ddmmyyyy(self.rate_date) if isinstance(self.rate_date, date) else self.rate_date,
+            self.status
+        )
 
     def to_dict(self) -> dict:
         """Converte para dicionário (para exportação em Excel)"""
-        return {
-            "Moeda entrada": self.from_currency,
-            "Taxa": 1,
-            "Moeda saída": self.to_currency,
-            "Valor cotação": round(self.rate_value, 3) if self.rate_value else 0,
-            "Data": self.rate_date.strftime("%d/%m/%Y") if isinstance(self.rate_date, date) else self.rate_date,
-            "Status": self.status
-        }
+        return dict(zip(EXCHANGE_RATE_COLUMNS, self.to_record()))
+
+    @classmethod
+    def many_to_frame(cls, rates: List["ExchangeRate"]) -> pd.DataFrame:
+        """
+        Monta o DataFrame de exportação (colunas de EXCHANGE_RATE_COLUMNS) para várias cotações
+
+        Os valores são arredondados de uma vez com NumPy, em vez de linha a linha.
+        """
+        values = np.fromiter(
+            (rate.rate_value or 0.0 for rate in rates), dtype=np.float64, count=len(rates))
+        return pd.DataFrame({
+            "Moeda entrada": [rate.from_currency for rate in rates],
+            "Taxa": np.ones(len(rates), dtype=np.int64),
+            "Moeda saída": [rate.to_currency for rate in rates],
+            "Valor cotação": np.round(values, 3),
+            "Data": [
+                _format_ddmmyyyy(rate.rate_date) if isinstance(rate.rate_date, date) else rate.rate_date
+                for rate in rates
+            ],
+            "Status": [rate.status for rate in rates],
+        }, columns=EXCHANGE_RATE_COLUMNS)
 
 
 # Funções para logs específicos e formatados
@@ -172,6 +475,10 @@ def log_query_error(currency_pair: CurrencyPair, error: str, execution_time: Opt
 # Função para logs técnicos detalhados
 def debug_log(level, message, exc_info=None):
     """Registra mensagens técnicas detalhadas no log de debug"""
+    # Evita despachar registros que nenhum handler vai gravar
+    if not debug_logger.isEnabledFor(logging.getLevelName(level)):
+        return
+
     if level == "INFO":
         debug_logger.info(message)
     elif level == "DEBUG":
@@ -187,28 +494,134 @@ def debug_log(level, message, exc_info=None):
 class BCBAutomation:
     """Classe principal para automação de cotações do Banco Central"""
 
-    def __init__(self, headless: bool = True, debug_screenshots: bool = False):
+    # Caminho do chromedriver, resolvido uma vez por processo e compartilhado entre as instâncias
+    _DRIVER_PATH: Optional[str] = None
+    _DRIVER_PATH_LOCK = threading.Lock()
+
+    @classmethod
+    def _driver_path(cls) -> str:
+        """Resolve o chromedriver apenas na primeira chamada, consultando o webdriver-manager só sem cache válido em disco"""
+        with cls._DRIVER_PATH_LOCK:
+            if cls._DRIVER_PATH is None:
+                cls._DRIVER_PATH = cls._cached_driver_path()
+            if cls._DRIVER_PATH is None:
+                cls._DRIVER_PATH = ChromeDriverManager().install()
+                try:
+                    _ensure_dir(os.path.dirname(DRIVER_PATH_CACHE))
+                    with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as f:
+                        f.write(cls._DRIVER_PATH)
+                except OSError:
+                    pass
+            return cls._DRIVER_PATH
+
+    @staticmethod
+    def _cached_driver_path() -> Optional[str]:
+        """Retorna o caminho salvo em disco se ainda for recente e o arquivo existir"""
+        try:
+            if time.time() - os.path.getmtime(DRIVER_PATH_CACHE) < DRIVER_PATH_TTL:
+                with open(DRIVER_PATH_CACHE, encoding="utf-8") as f:
+                    cached_path = f.read().strip()
+                if cached_path and os.path.exists(cached_path):
+                    return cached_path
+        except OSError:
+            pass
+        return None
+
+    # Cache de cotações aberto uma vez por processo e compartilhado entre as instâncias (e threads)
+    _RATE_CACHE: Optional[shelve.Shelf] = None
+    _RATE_CACHE_LOCK = threading.Lock()
+
+    @classmethod
+    def _rate_cache(cls) -> shelve.Shelf:
+        """Abre o cache de cotações no primeiro uso (chamar com _RATE_CACHE_LOCK adquirido)"""
+        if cls._RATE_CACHE is None:
+            _ensure_dir(os.path.dirname(RATE_CACHE_FILE))
+            cls._RATE_CACHE = shelve.open(RATE_CACHE_FILE)
+            atexit.register(cls._RATE_CACHE.close)
+        return cls._RATE_CACHE
+
+    @staticmethod
+    def _rate_cache_key(currency_pair: CurrencyPair, rate_date: date) -> str:
+        return f"{currency_pair.from_currency}|{currency_pair.to_currency}|{rate_date.isoformat()}"
+
+    def _get_cached_rate(self, currency_pair: CurrencyPair, rate_date: date) -> Optional[ExchangeRate]:
+        """Retorna a cotação do cache se ainda for válida"""
+        try:
+            with self._RATE_CACHE_LOCK:
+                entry = self._rate_cache().get(self._rate_cache_key(currency_pair, rate_date))
+        except Exception as e:
+            debug_log("WARNING", f"Erro ao ler cache de cotações: {str(e)}")
+            return None
+
+        if not entry:
+            return None
+        if rate_date >= date.today() and entry["ts"] <= time.time() - RATE_CACHE_TTL_TODAY:
+            return None
+
+        return ExchangeRate(
+            from_currency=currency_pair.from_currency,
+            to_currency=currency_pair.to_currency,
+            rate_value=entry["rate"],
+            rate_date=entry["date"],
+            status=entry["status"],
+            execution_time=0.0
+        )
+
+    def _set_cached_rate(self, currency_pair: CurrencyPair, rate_date: date, exchange_rate: ExchangeRate):
+        """Guarda uma cotação válida no cache (falhas nunca são guardadas)"""
+        try:
+            with self._RATE_CACHE_LOCK:
+                cache = self._rate_cache()
+                cache[self._rate_cache_key(currency_pair, rate_date)] = {
+                    "rate": exchange_rate.rate_value,
+                    "date": exchange_rate.rate_date,
+                    "status": exchange_rate.status,
+                    "ts": time.time(),
+                }
+                cache.sync()
+        except Exception as e:
+            debug_log("WARNING", f"Erro ao gravar cache de cotações: {str(e)}")
+
+    def __init__(self, headless: bool = True, debug_screenshots: bool = False, max_workers: int = 1,
+                 keep_driver: bool = False):
         self.url = "https://www.bcb.gov.br/conversao"
         self.headless = headless
         self.debug_screenshots = debug_screenshots
+        self.max_workers = max_workers
+        # Se True, o navegador continua aberto entre execuções (fechado só por close_driver)
+        self.keep_driver = keep_driver
         self.driver = None
 
+        # Indica se o formulário de conversão já está carregado no navegador
+        self._page_ready = False
+        # Os banners (cookies) só precisam ser fechados uma vez por sessão do navegador
+        self._banners_closed = False
+        # Espera antes da próxima consulta; só cresce quando o site indica bloqueio
+        self._backoff = 0.0
+
         # Diretórios de entrada e saída - adaptados para estrutura Dagster
-        self.input_dir = os.path.join(os.path.dirname(os.path.dirname(
-            os.path.dirname(os.path.abspath(__file__)))), "assets", "input")
-        self.output_dir = os.path.join(os.path.dirname(os.path.dirname(
-            os.path.dirname(os.path.abspath(__file__)))), "assets", "output")
-        self.screenshots_dir = os.path.join(os.path.dirname(os.path.dirname(
-            os.path.dirname(os.path.abspath(__file__)))), "assets", "screenshots")
-
-        # Garante que os diretórios existem
-        os.makedirs(self.input_dir, exist_ok=True)
-        os.makedirs(self.output_dir, exist_ok=True)
-        if self.debug_screenshots:
-            os.makedirs(self.screenshots_dir, exist_ok=True)
+        # (calculados e criados uma única vez, na importação de config)
+        self.input_dir = INPUT_DIR
+        self.output_dir = OUTPUT_DIR
+        self.screenshots_dir = SCREENSHOTS_DIR
+
+    def _driver_alive(self) -> bool:
+        """Verifica se o navegador atual ainda responde"""
+        try:
+            self.driver.title
+            return True
+        except WebDriverException:
+            return False
 
     def setup_driver(self):
         """Configura o driver do Selenium com opções otimizadas"""
+        # Reaproveita o navegador já aberto, se ainda responde
+        if self.driver is not None:
+            if self._driver_alive():
+                debug_log("DEBUG", "Reaproveitando o driver do Selenium já aberto")
+                return
+            self.close_driver()
+
         options = webdriver.ChromeOptions()
         if self.headless:
             options.add_argument("--headless=new")
@@ -229,18 +642,42 @@ class BCBAutomation:
         prefs = {
             "profile.default_content_setting_values.notifications": 2,  # Bloquear notificações
             "profile.default_content_settings.popups": 0,  # Bloquear popups
+            # Não baixa imagens, fontes e plugins (o CSS fica: a visibilidade dos elementos depende dele)
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.managed_default_content_settings.plugins": 2,
             "download.prompt_for_download": False,
             "download.directory_upgrade": True,
             "safebrowsing.enabled": True
         }
         options.add_experimental_option("prefs", prefs)
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        # Serviços em segundo plano do Chrome que só geram tráfego e CPU extras
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-translate")
+        options.add_argument("--metrics-recording-only")
+        options.add_argument("--mute-audio")
+
+        # driver.get retorna no DOMContentLoaded; as esperas explícitas cuidam do resto
+        options.page_load_strategy = "eager"
 
         try:
             self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
+                service=Service(self._driver_path()),
                 options=options
             )
 
+            self._page_ready = False
+            self._banners_closed = False
+
+            # Bloqueia analytics, fontes e imagens de terceiros em todas as navegações (via CDP)
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+            except Exception as e:
+                debug_log("DEBUG", f"Não foi possível bloquear requisições externas: {str(e)}")
+
             # Define um timeout de página padrão mais alto
             self.driver.set_page_load_timeout(60)
 
@@ -254,14 +691,18 @@ class BCBAutomation:
             raise
 
     def close_driver(self):
-        """Fecha o driver do Selenium"""
+        """Fecha o driver do Selenium (pode ser chamado mais de uma vez)"""
         if self.driver:
             try:
                 self.driver.quit()
-                self.driver = None
                 debug_log("INFO", "Driver do Selenium fechado")
             except Exception as e:
                 debug_log("ERROR", f"Erro ao fechar o driver: {str(e)}")
+            finally:
+                # Mesmo com erro no quit, o driver não é mais usado
+                self.driver = None
+                self._page_ready = False
+                self._banners_closed = False
 
     def take_screenshot(self, name: str):
         """Captura screenshot para debug"""
@@ -276,67 +717,28 @@ class BCBAutomation:
     def _close_banners(self):
         """Tenta fechar banners/avisos que possam estar atrapalhando"""
         try:
-            # Aguarda um pouco para garantir que os banners são carregados
-            time.sleep(3)
-
             # Lista de seletores específicos para o banner de cookies do BCB
             cookie_selectors = [
                 # Seletor por classe específica
-                (By.CSS_SELECTOR, "button.btn-primary.btn-accept"),
+                "//button[contains(@class, 'btn-primary') and contains(@class, 'btn-accept')]",
                 # XPath exato fornecido
-                (By.XPATH,
-                 "/html/body/app-root/bcb-cookies/div/div/div/div/button[2]"),
+                "/html/body/app-root/bcb-cookies/div/div/div/div/button[2]",
                 # Seletor por texto
-                (By.XPATH, "//button[contains(text(), 'Prosseguir')]"),
+                "//button[contains(text(), 'Prosseguir')]",
                 # Seletor combinado
-                (By.XPATH,
-                 "//div[contains(@class, 'text-center')]/button[contains(@class, 'btn-accept')]"),
+                "//div[contains(@class, 'text-center')]/button[contains(@class, 'btn-accept')]",
                 # Botão por tipo
-                (By.XPATH,
-                 "//button[@type='button' and contains(@class, 'btn-primary')]")
+                "//button[@type='button' and contains(@class, 'btn-primary')]"
             ]
 
-            # Flag para controlar se o banner foi fechado
-            cookie_banner_closed = False
-
-            # Tenta cada seletor até encontrar e clicar no botão
-            for by, selector in cookie_selectors:
-                if cookie_banner_closed:
-                    break
-
-                try:
-                    elements = self.driver.find_elements(by, selector)
-
-                    for element in elements:
-                        try:
-                            if element.is_displayed():
-                                # Scroll para o elemento
-                                self.driver.execute_script(
-                                    "arguments[0].scrollIntoView({block: 'center'});", element)
-                                time.sleep(0.5)
-
-                                # Tenta clicar de várias maneiras
-                                try:
-                                    # Tenta clique direto
-                                    element.click()
-                                except:
-                                    try:
-                                        # Tenta com JavaScript
-                                        self.driver.execute_script(
-                                            "arguments[0].click();", element)
-                                    except:
-                                        # Última tentativa com Actions
-                                        from selenium.webdriver.common.action_chains import ActionChains
-                                        ActionChains(self.driver).move_to_element(
-                                            element).click().perform()
-
-                                cookie_banner_closed = True
-                                time.sleep(1)  # Espera para processamento
-                                break
-                        except:
-                            continue
-                except:
-                    continue
+            # Procura e clica no banner numa única chamada por verificação, por no máximo 3s;
+            # se ele não aparecer nesse tempo, segue sem banner
+            try:
+                outcome = WebDriverWait(self.driver, 3, poll_frequency=0.2).until(
+                    lambda driver: driver.execute_script(_DISMISS_BANNER_JS, cookie_selectors))
+                debug_log("DEBUG", f"Banner de cookies: {outcome}")
+            except TimeoutException:
+                debug_log("DEBUG", "Banner de cookies ausente")
 
             # Verifica outras possíveis distrações
             generic_selectors = [
@@ -347,18 +749,9 @@ class BCBAutomation:
                 "//div[contains(@class, 'modal-header')]//button"
             ]
 
-            for selector in generic_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            self.driver.execute_script(
-                                "arguments[0].click();", element)
-                            time.sleep(0.5)
-                except:
-                    continue
+            self.driver.execute_script(_CLICK_ALL_VISIBLE_JS, generic_selectors)
 
-        except:
+        except WebDriverException:
             # Não falha a execução por erro nesta etapa
             pass
 
@@ -378,47 +771,28 @@ class BCBAutomation:
                 raise ValueError(
                     "Dependência necessária não encontrada: openpyxl. Use 'pip install openpyxl' para instalar.")
 
-            # Verifica se o arquivo existe no diretório raiz primeiro
+            # Verifica se o arquivo existe no diretório raiz primeiro; um CSV com o mesmo
+            # nome tem preferência sobre o Excel, pois é lido sem o parser de Excel
+            csv_filepath = os.path.splitext(filepath)[0] + ".csv"
             if os.path.exists("currencies.xlsx"):
                 filepath = "currencies.xlsx"
                 debug_log(
                     "INFO", f"Usando arquivo de moedas do diretório raiz: {filepath}")
+            elif os.path.exists(csv_filepath):
+                filepath = csv_filepath
+                debug_log("INFO", f"Usando arquivo de moedas em CSV: {filepath}")
             elif not os.path.exists(filepath):
                 debug_log(
                     "WARNING", f"Arquivo {filepath} não encontrado. Criando arquivo de exemplo.")
                 filepath = self.create_sample_input_file()
 
-            df = pd.read_excel(filepath)
-
-            # Primeiro, tenta com os nomes de coluna esperados
-            try:
-                if "Moeda Origem" in df.columns and "Moeda Destino" in df.columns:
-                    # Formato português
-                    column_from = "Moeda Origem"
-                    column_to = "Moeda Destino"
-                elif "from" in df.columns and "to" in df.columns:
-                    # Formato inglês
-                    column_from = "from"
-                    column_to = "to"
-                else:
-                    # Tenta usar as duas primeiras colunas, independente dos nomes
-                    if len(df.columns) >= 2:
-                        column_from = df.columns[0]
-                        column_to = df.columns[1]
-                    else:
-                        raise ValueError(
-                            "Arquivo precisa ter pelo menos duas colunas")
-            except Exception as e:
-                debug_log("ERROR", f"Erro ao detectar colunas: {str(e)}")
-                raise ValueError(f"Erro no formato do arquivo: {str(e)}")
+            # Leitura (com cache por mtime) e detecção de colunas ficam no repository
+            df = load_currency_pairs(filepath)
 
             # Converte para lista de pares de moedas
             currency_pairs = [
-                CurrencyPair(
-                    from_currency=str(row[column_from]),
-                    to_currency=str(row[column_to])
-                )
-                for _, row in df.iterrows()
+                CurrencyPair(from_currency=from_currency, to_currency=to_currency)
+                for from_currency, to_currency in zip(df["from_currency"].tolist(), df["to_currency"].tolist())
             ]
 
             debug_log("INFO", f"Lidos {len(currency_pairs)} pares de moedas")
@@ -447,96 +821,54 @@ class BCBAutomation:
 
         debug_log("INFO", "Criando arquivo de exemplo com pares de moedas")
 
-        # Cria DataFrame com pares de exemplo
-        data = {
-            'Moeda Origem': ['USD', 'EUR', 'GBP', 'JPY', 'BRL'],
-            'Moeda Destino': ['BRL', 'BRL', 'BRL', 'BRL', 'USD']
-        }
-
-        # Garante que o diretório existe
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Salva o DataFrame como Excel
-        df = pd.DataFrame(data)
-        df.to_excel(file_path, index=False)
+        create_sample_currency_file(file_path)
 
         debug_log("INFO", f"Arquivo de exemplo criado em {file_path}")
 
         return file_path
 
-    def _select_currency(self, button_id: str, currency_name: str):
-        """Seleciona uma moeda no dropdown - Versão melhorada"""
-        try:
-            # Localiza o botão do dropdown
-            button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, button_id))
-            )
+    def _first_visible(self, xpaths: List[str]):
+        """Retorna o primeiro elemento visível entre os XPaths (ou None), com uma só chamada ao navegador"""
+        return self.driver.execute_script(_FIRST_VISIBLE_JS, list(xpaths))
 
-            # Scroll até o botão para garantir visibilidade
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center'});", button)
-            time.sleep(0.5)
+    def _click_first_visible(self, xpaths: List[str]) -> bool:
+        """Clica no primeiro elemento visível entre os XPaths, com uma só chamada ao navegador"""
+        return bool(self.driver.execute_script(_CLICK_FIRST_VISIBLE_JS, list(xpaths)))
 
-            # Clica no botão dropdown usando JavaScript
-            self.driver.execute_script("arguments[0].click();", button)
-            time.sleep(1.5)
+    def _click_when_visible(self, xpaths: List[str], timeout: int = 5) -> bool:
+        """Clica no primeiro elemento visível assim que aparecer; cada verificação é uma única chamada"""
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: self._click_first_visible(xpaths))
+        except TimeoutException:
+            return False
 
-            # Localiza os itens do dropdown usando seletores específicos
-            item_selectors = [
-                f"//ul[@id='{button_id.replace('button-', '')}']//a[contains(text(), '{currency_name}')]",
-                f"//div[contains(@class, 'dropdown-menu')]//a[contains(text(), '{currency_name}')]",
-                f"//a[contains(@class, 'dropdown-item')][contains(text(), '{currency_name}')]"
-            ]
+    def _open_dropdown(self, button_id: str, timeout: int = 10):
+        """Clica no botão do dropdown assim que ele existir na página"""
+        WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+            lambda driver: driver.execute_script(_CLICK_BY_ID_JS, button_id))
 
-            for selector in item_selectors:
-                try:
-                    items = self.driver.find_elements(By.XPATH, selector)
+    def _select_currency(self, button_id: str, currency_name: str):
+        """Seleciona uma moeda no dropdown - Versão melhorada"""
+        try:
+            # Seletores específicos dos itens do dropdown
+            fields = {"menu_id": button_id.replace("button-", ""), "currency": currency_name}
+            item_selectors = [xpath.format_map(fields) for xpath in _CURRENCY_ITEM_XPATHS]
 
-                    if items:
-                        for item in items:
-                            try:
-                                # Verifica se está visível
-                                if item.is_displayed():
-                                    # Scroll e clique
-                                    self.driver.execute_script(
-                                        "arguments[0].scrollIntoView({block: 'center'});",
-                                        item
-                                    )
-                                    time.sleep(0.5)
-
-                                    # Clica usando JavaScript
-                                    self.driver.execute_script(
-                                        "arguments[0].click();", item)
-                                    return True
-                            except:
-                                continue
-                except:
-                    continue
+            # Abre o dropdown e clica no item assim que ele ficar visível, sem pausas fixas
+            self._open_dropdown(button_id)
+            if self._click_when_visible(item_selectors):
+                return True
 
             # Se não conseguiu selecionar, tenta abordagem alternativa
             try:
                 # Clica novamente no dropdown para garantir que está aberto
-                self.driver.execute_script("arguments[0].click();", button)
-                time.sleep(1)
+                self._open_dropdown(button_id)
 
-                # Tenta usar índice de elementos
-                items = self.driver.find_elements(
-                    By.XPATH, "//a[contains(@class, 'dropdown-item')]")
-
-                # Procura por texto contendo a moeda
-                for item in items:
-                    try:
-                        item_text = item.text.strip()
-                        if currency_name in item_text:
-                            self.driver.execute_script(
-                                "arguments[0].scrollIntoView({block: 'center'});", item)
-                            time.sleep(0.5)
-                            self.driver.execute_script(
-                                "arguments[0].click();", item)
-                            return True
-                    except:
-                        pass
-            except:
+                # Procura qualquer item do dropdown cujo texto contenha a moeda
+                if self._click_when_visible([_CURRENCY_ITEM_FALLBACK_XPATH.format_map(fields)]):
+                    return True
+            except WebDriverException:
                 pass
 
             raise ValueError(
@@ -546,28 +878,60 @@ class BCBAutomation:
             raise ValueError(
                 f"Erro ao selecionar moeda {currency_name}: {str(e)}")
 
+    def _ensure_page_loaded(self) -> str:
+        """
+        Garante o formulário de conversão carregado, abrindo o navegador se preciso
+
+        A página é carregada uma vez; os pares seguintes reaproveitam o formulário.
+
+        Returns:
+            str: Texto do resultado já exibido (vazio se a página acabou de ser carregada)
+        """
+        if not self.driver:
+            self.setup_driver()
+
+        if self._page_ready:
+            return self._result_container_text()
+
+        # Acessa a página de conversão; se ela já está aberta (ex.: após um erro no par anterior),
+        # só recarrega, aproveitando conexões e recursos em cache
+        try:
+            if self.driver.current_url.startswith(self.url):
+                self.driver.refresh()
+            else:
+                self.driver.get(self.url)
+        except WebDriverException:
+            self.driver.get(self.url)
+
+        # Aguarda carregar a página
+        wait = WebDriverWait(self.driver, 30)
+        wait.until(EC.presence_of_element_located(
+            (By.ID, "button-converter-de")))
+
+        # Tenta fechar quaisquer banners/avisos (uma vez por sessão)
+        if not self._banners_closed:
+            self._close_banners()
+            self._banners_closed = True
+        self._page_ready = True
+        return ""
+
     def get_exchange_rate(self, currency_pair: CurrencyPair, rate_date: Optional[date] = None) -> ExchangeRate:
         """Obtém a taxa de câmbio para o par de moedas especificado"""
         if not rate_date:
             rate_date = date.today()
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         log_query_start(currency_pair)
 
-        try:
-            if not self.driver:
-                self.setup_driver()
+        # Par já consultado para a data: não abre o navegador
+        cached_rate = self._get_cached_rate(currency_pair, rate_date)
+        if cached_rate is not None:
+            debug_log("INFO", f"Cotação {currency_pair} obtida do cache")
+            log_query_end(currency_pair, 0.0, cached_rate.rate_value)
+            return cached_rate
 
-            # Acessa a página de conversão
-            self.driver.get(self.url)
-
-            # Aguarda carregar a página
-            wait = WebDriverWait(self.driver, 30)
-            wait.until(EC.presence_of_element_located(
-                (By.ID, "button-converter-de")))
-
-            # Tenta fechar quaisquer banners/avisos
-            self._close_banners()
+        try:
+            previous_result = self._ensure_page_loaded()
 
             # Seleciona a moeda de origem
             self._select_currency("button-converter-de",
@@ -589,23 +953,11 @@ class BCBAutomation:
                     "//input[@id='data-moeda']"
                 ]
 
-                date_input = None
-                for selector in date_input_selectors:
-                    try:
-                        elements = self.driver.find_elements(
-                            By.XPATH, selector)
-                        for element in elements:
-                            if element.is_displayed():
-                                date_input = element
-                                break
-                        if date_input:
-                            break
-                    except:
-                        continue
-
-                if not date_input:
-                    # Se não encontrou com seletores diretos, tenta JavaScript
-                    date_str = rate_date.strftime('%d/%m/%Y')
+                date_str = rate_date.strftime('%d/%m/%Y')
+
+                # Localiza e preenche o campo (com os eventos de validação) numa única chamada
+                if not self.driver.execute_script(_FILL_FIRST_VISIBLE_JS, date_input_selectors, date_str):
+                    # Se não encontrou com seletores diretos, usa o primeiro input de texto
                     js_script = f"""
                     var inputs = document.getElementsByTagName('input');
                     for(var i = 0; i < inputs.length; i++) {{
@@ -620,24 +972,6 @@ class BCBAutomation:
                     """
 
                     self.driver.execute_script(js_script)
-                else:
-                    # Limpa o campo antes
-                    date_input.clear()
-
-                    # Preenche o campo de data
-                    date_str = rate_date.strftime('%d/%m/%Y')
-                    date_input.send_keys(date_str)
-
-                    # Também tenta via JavaScript para garantir
-                    self.driver.execute_script(
-                        "arguments[0].value = arguments[1];", date_input, date_str)
-
-                    # Simula eventos para validação
-                    self.driver.execute_script(
-                        "arguments[0].dispatchEvent(new Event('change', { bubbles: true }));"
-                        "arguments[0].dispatchEvent(new Event('blur', { bubbles: true }));",
-                        date_input
-                    )
 
             except Exception as e:
                 debug_log("ERROR", f"Erro ao preencher data: {str(e)}")
@@ -653,38 +987,20 @@ class BCBAutomation:
                     "//form//button"
                 ]
 
-                search_button = None
-                for selector in search_button_selectors:
-                    try:
-                        elements = self.driver.find_elements(
-                            By.XPATH, selector)
-                        for element in elements:
-                            if element.is_displayed():
-                                search_button = element
-                                break
-                        if search_button:
-                            break
-                    except:
-                        continue
+                search_button = self._first_visible(search_button_selectors)
 
                 if search_button:
                     # Tenta clicar de várias maneiras
                     try:
-                        # Scroll para garantir visibilidade
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});", search_button)
-                        time.sleep(0.5)
-
                         # Tenta clique direto
                         search_button.click()
-                    except:
+                    except (ElementClickInterceptedException, ElementNotInteractableException, StaleElementReferenceException):
                         try:
                             # Tenta com JavaScript
                             self.driver.execute_script(
                                 "arguments[0].click();", search_button)
-                        except:
+                        except WebDriverException:
                             # Última tentativa com Actions
-                            from selenium.webdriver.common.action_chains import ActionChains
                             ActionChains(self.driver).move_to_element(
                                 search_button).click().perform()
                 else:
@@ -708,15 +1024,20 @@ class BCBAutomation:
                 debug_log(
                     "ERROR", f"Erro ao clicar no botão de conversão: {str(e)}")
 
-            # Aguarda o resultado aparecer
-            # Aguarda mais tempo para processamento da requisição
-            time.sleep(5)
+            # Aguarda um resultado novo aparecer, em vez de uma pausa fixa; qualquer outro
+            # texto no card (ex.: o próprio formulário) é ignorado
+            try:
+                WebDriverWait(self.driver, 15).until(
+                    lambda driver: self._result_container_text() not in ("", previous_result)
+                )
+            except TimeoutException:
+                debug_log("WARNING", "Resultado não apareceu no tempo esperado")
             self.take_screenshot("result_screen_capture")
 
             # Extrai o resultado
             rate_value, actual_date = self._extract_result()
 
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
             # Define status com base no resultado
             if rate_value > 0:
@@ -733,7 +1054,7 @@ class BCBAutomation:
                 log_query_warning(
                     currency_pair, "Valor não encontrado", execution_time)
 
-            return ExchangeRate(
+            exchange_rate = ExchangeRate(
                 from_currency=currency_pair.from_currency,
                 to_currency=currency_pair.to_currency,
                 rate_value=rate_value,
@@ -741,161 +1062,127 @@ class BCBAutomation:
                 status=status,
                 execution_time=execution_time
             )
+            if rate_value > 0:
+                self._set_cached_rate(currency_pair, rate_date, exchange_rate)
+            return exchange_rate
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            # Estado da página desconhecido: o próximo par recarrega o formulário
+            self._page_ready = False
+
+            execution_time = time.perf_counter() - start_time
             log_query_error(currency_pair, str(e), execution_time)
 
             # Captura screenshot do erro
             self.take_screenshot(
                 f"error_{currency_pair.from_currency}_{currency_pair.to_currency}")
 
-            return ExchangeRate(
-                from_currency=currency_pair.from_currency,
-                to_currency=currency_pair.to_currency,
-                rate_value=0.0,
-                rate_date=rate_date,
-                status=f"Erro: {str(e)}",
-                execution_time=execution_time
-            )
+            return ExchangeRate.error(currency_pair, rate_date, e, execution_time)
+
+    def _result_container_text(self) -> str:
+        """Texto atual do resultado da conversão (vazio se nenhum resultado foi exibido ainda)"""
+        return self.driver.execute_script(_RESULT_CONTAINER_TEXT_JS) or ""
 
     def _extract_result(self) -> Tuple[float, date]:
         """Extrai o resultado da conversão e a data usando abordagens variadas"""
         try:
-            # Valor padrão caso não consiga extrair
+            # Valor padrão caso não consiga extrair; a data fica None até ser encontrada
             rate_value = 0.0
-            actual_date = date.today()
-
-            # Captura todo o texto do resultado
-            result_text = ""
-            try:
-                # Captura o elemento que contém o resultado completo
-                result_container = self.driver.find_element(
-                    By.XPATH, "//div[contains(@class, 'card-body')]")
-                if result_container:
-                    result_text = result_container.text
-                    debug_log(
-                        "INFO", f"Texto completo encontrado: {result_text}")
-            except Exception as e:
-                debug_log(
-                    "DEBUG", f"Erro ao capturar container de resultado: {str(e)}")
-                # Captura HTML da página como alternativa
-                result_text = self.driver.page_source
-
-            # Extração da taxa de câmbio usando padrões específicos do BCB
-            # Padrão 1: "Resultado da conversão: X,XXXX"
-            conversion_match = re.search(
-                r'Resultado da conversão:?\s*([\d,.]+)', result_text)
-            if conversion_match:
-                value_str = conversion_match.group(
-                    1).replace(".", "").replace(",", ".")
+            actual_date = None
+
+            # Só o texto do resultado; os seletores alternativos são lidos apenas se necessário
+            result = self.driver.execute_script(_RESULT_TEXTS_JS, False) or {}
+            result_text = result.get("text") or ""
+            debug_log("INFO", f"Texto completo encontrado: {result_text}")
+
+            # Extração da taxa de câmbio usando padrões específicos do BCB:
+            # "Resultado da conversão: X,XXXX" e depois "1 MoedaA = X,XXXX MoedaB".
+            # Para no primeiro valor válido
+            for pattern in _RATE_PATTERNS:
+                match = pattern.search(result_text)
+                if not match:
+                    continue
+                value_str = match.group(1)
                 try:
-                    rate_value = float(value_str)
-                    debug_log(
-                        "INFO", f"Valor extraído do padrão 'Resultado da conversão': {rate_value}")
+                    value = _parse_brl_number(value_str)
                 except ValueError:
                     debug_log(
                         "WARNING", f"Não foi possível converter '{value_str}' para número")
-
-            # Padrão 2: "1 MoedaA = X,XXXX MoedaB"
-            if rate_value == 0.0:
-                tax_match = re.search(
-                    r'1\s+[\w/()]+\s+=\s+([\d,.]+)', result_text)
-                if tax_match:
-                    value_str = tax_match.group(1).replace(
-                        ".", "").replace(",", ".")
-                    try:
-                        rate_value = float(value_str)
-                        debug_log(
-                            "INFO", f"Valor extraído do padrão de taxa: {rate_value}")
-                    except ValueError:
-                        debug_log(
-                            "WARNING", f"Não foi possível converter '{value_str}' para número")
+                    continue
+                # Valor fora da faixa (ex.: o montante convertido): tenta o próximo padrão
+                if not _is_plausible_rate(value):
+                    debug_log(
+                        "WARNING", f"Valor '{value_str}' fora da faixa esperada para uma taxa")
+                    continue
+                rate_value = value
+                debug_log(
+                    "INFO", f"Valor extraído do padrão '{pattern.pattern}': {rate_value}")
+                break
 
             # Extração da data usando o padrão específico do BCB
-            date_match = re.search(
-                r'Data cotação utilizada:?\s*(\d{2}/\d{2}/\d{4})', result_text)
+            date_match = _QUOTE_DATE_RE.search(result_text)
             if date_match:
                 date_str = date_match.group(1)
                 try:
-                    actual_date = datetime.strptime(
-                        date_str, "%d/%m/%Y").date()
+                    actual_date = _parse_ddmmyyyy(date_str)
                     debug_log("INFO", f"Data extraída: {actual_date}")
                 except ValueError:
                     debug_log(
                         "WARNING", f"Não foi possível converter '{date_str}' para data")
 
+            # Taxa e data encontradas: dispensa os seletores alternativos
+            if rate_value > 0 and actual_date is not None:
+                return rate_value, actual_date
+
+            # Textos dos seletores alternativos, numa única chamada ao navegador
+            result = self.driver.execute_script(_RESULT_TEXTS_JS, True) or {}
+
             # Se não encontrou com os padrões específicos, usa as abordagens genéricas existentes
             if rate_value == 0.0:
-                # Abordagens existentes para extração de taxa
-                result_selectors = [
-                    "//strong[contains(text(), 'Resultado da conversão')]/following-sibling::text()",
-                    "//strong[contains(text(), 'Resultado da conversão')]/..",
-                    "//h3[contains(text(), 'Resultado da conversão')]/..",
-                    "//div[contains(@class, 'card-body')]//strong[2]"
-                ]
+                # Textos já lidos pelos seletores alternativos de taxa
+                for elem_texts in result.get("rate_texts") or []:
+                    for elem_text in elem_texts:
+                        debug_log(
+                            "INFO", f"Texto encontrado: {elem_text}")
 
-                for selector in result_selectors:
-                    try:
-                        elements = self.driver.find_elements(
-                            By.XPATH, selector)
-                        if elements:
-                            for element in elements:
-                                # Extrai o texto
-                                elem_text = element.text
+                        # Procura por um valor numérico no formato X,XXX ou X.XXX
+                        number_match = _NUMBER_RE.search(elem_text)
+                        if number_match:
+                            value_str = number_match.group(1)
+                            try:
+                                rate_value = _parse_brl_number(value_str)
                                 debug_log(
-                                    "INFO", f"Texto encontrado: {elem_text}")
-
-                                # Procura por um valor numérico no formato X,XXX ou X.XXX
-                                number_match = re.search(
-                                    r'(\d+[,.]\d+)', elem_text)
-                                if number_match:
-                                    value_str = number_match.group(
-                                        1).replace(".", "").replace(",", ".")
-                                    try:
-                                        rate_value = float(value_str)
-                                        debug_log(
-                                            "INFO", f"Valor extraído com sucesso: {rate_value}")
-                                        break
-                                    except ValueError:
-                                        debug_log(
-                                            "WARNING", f"Não foi possível converter '{value_str}' para número")
-                    except Exception as e:
-                        debug_log(
-                            "DEBUG", f"Erro ao tentar extrair com seletor {selector}: {str(e)}")
+                                    "INFO", f"Valor extraído com sucesso: {rate_value}")
+                                break
+                            except ValueError:
+                                debug_log(
+                                    "WARNING", f"Não foi possível converter '{value_str}' para número")
+
+                    # Para no primeiro seletor que trouxe um valor
+                    if rate_value > 0:
+                        break
 
             # Abordagem para data se ainda não encontrou
-            if actual_date == date.today():
-                date_selectors = [
-                    "//strong[contains(text(), 'Data cotação')]/..",
-                    "//div[contains(text(), 'Data')]"
-                ]
+            if actual_date is None:
+                # Textos já lidos pelos seletores alternativos de data
+                for elem_texts in result.get("date_texts") or []:
+                    for date_text in elem_texts:
+                        date_match = _DATE_RE.search(date_text)
+                        if date_match:
+                            date_str = date_match.group(1)
+                            try:
+                                actual_date = _parse_ddmmyyyy(date_str)
+                                debug_log(
+                                    "INFO", f"Data extraída: {actual_date}")
+                                break
+                            except ValueError:
+                                debug_log(
+                                    "WARNING", f"Não foi possível converter '{date_str}' para data")
 
-                for selector in date_selectors:
-                    try:
-                        elements = self.driver.find_elements(
-                            By.XPATH, selector)
-                        if elements:
-                            for element in elements:
-                                date_text = element.text
-                                date_match = re.search(
-                                    r'(\d{2}/\d{2}/\d{4})', date_text)
-                                if date_match:
-                                    date_str = date_match.group(1)
-                                    try:
-                                        actual_date = datetime.strptime(
-                                            date_str, "%d/%m/%Y").date()
-                                        debug_log(
-                                            "INFO", f"Data extraída: {actual_date}")
-                                        break
-                                    except ValueError:
-                                        debug_log(
-                                            "WARNING", f"Não foi possível converter '{date_str}' para data")
-                    except Exception as e:
-                        debug_log(
-                            "DEBUG", f"Erro ao tentar extrair data com seletor {selector}: {str(e)}")
+                    if actual_date is not None:
+                        break
 
-            return rate_value, actual_date
+            return rate_value, actual_date or date.today()
 
         except Exception as e:
             debug_log(
@@ -903,8 +1190,74 @@ class BCBAutomation:
             # Retorna valores padrão para não bloquear o processo
             return 0.0, date.today()
 
-    def extract_all_exchange_rates(self, currency_pairs: List[CurrencyPair], rate_date: Optional[date] = None) -> List[ExchangeRate]:
-        """Extrai cotações para uma lista de pares de moedas"""
+    def _page_blocked(self) -> bool:
+        """Indica se a página atual parece ser uma resposta de bloqueio do site"""
+        if self.driver is None:
+            return False
+        try:
+            text = self.driver.execute_script(
+                "return document.title + ' ' + (document.body ? document.body.innerText.slice(0, 500) : '');")
+        except WebDriverException:
+            return False
+        return bool(_BLOCKED_PAGE_RE.search(text or ""))
+
+    def _extract_one(self, currency_pair: CurrencyPair, rate_date: date) -> ExchangeRate:
+        """Extrai a cotação de um par sem propagar exceções"""
+        # Só espera se uma consulta anterior encontrou a página de bloqueio
+        if self._backoff:
+            time.sleep(self._backoff)
+
+        try:
+            # Log de início da consulta é feito dentro de get_exchange_rate
+            exchange_rate = self.get_exchange_rate(
+                currency_pair=currency_pair,
+                rate_date=rate_date
+            )
+        except Exception as e:
+            # Cria um registro de erro para manter o processamento das demais moedas
+            exchange_rate = ExchangeRate.error(currency_pair, rate_date, e)
+
+        # Sem pausa fixa entre consultas: a espera dobra a cada bloqueio detectado
+        # e cai pela metade a cada consulta bem-sucedida
+        if exchange_rate.rate_value > 0:
+            self._backoff = self._backoff / 2 if self._backoff >= 1 else 0.0
+        elif self._page_blocked():
+            self._backoff = min(max(self._backoff * 2, 1.0), BLOCK_BACKOFF_MAX)
+            debug_log(
+                "WARNING", f"Possível bloqueio pelo site; aguardando {self._backoff:.1f}s antes da próxima consulta")
+        return exchange_rate
+
+    def _extract_parallel(self, currency_pairs: List[CurrencyPair], rate_date: date, max_workers: int) -> Iterator[ExchangeRate]:
+        """Distribui as consultas entre threads, cada uma com seu próprio navegador"""
+        local = threading.local()
+        # A primeira thread usa esta instância (e o navegador dela, se já aberto); as demais
+        # criam uma instância própria
+        available = [self]
+        workers = []
+
+        def extract(currency_pair: CurrencyPair) -> ExchangeRate:
+            # O navegador de cada thread é criado no primeiro par e reaproveitado nos seguintes
+            worker = getattr(local, "automation", None)
+            if worker is None:
+                try:
+                    worker = available.pop()
+                except IndexError:
+                    worker = BCBAutomation(
+                        headless=self.headless, debug_screenshots=self.debug_screenshots)
+                    workers.append(worker)
+                local.automation = worker
+            return worker._extract_one(currency_pair, rate_date)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from executor.map(extract, currency_pairs)
+        finally:
+            # O navegador desta instância é fechado (ou mantido) por iter_exchange_rates
+            for worker in workers:
+                worker.close_driver()
+
+    def iter_exchange_rates(self, currency_pairs: List[CurrencyPair], rate_date: Optional[date] = None) -> Iterator[ExchangeRate]:
+        """Extrai cotações para uma lista de pares de moedas, entregando cada uma assim que fica pronta"""
         if not rate_date:
             rate_date = date.today()
 
@@ -913,123 +1266,91 @@ class BCBAutomation:
         debug_log(
             "INFO", f"Iniciando extração de {len(currency_pairs)} cotações para a data {rate_date.strftime('%d/%m/%Y')}")
 
-        results = []
+        total = len(currency_pairs)
         success_count = 0
         warning_count = 0
         error_count = 0
 
         try:
-            for currency_pair in currency_pairs:
-                try:
-                    # Log de início da consulta é feito dentro de get_exchange_rate
-
-                    exchange_rate = self.get_exchange_rate(
-                        currency_pair=currency_pair,
-                        rate_date=rate_date
-                    )
-
-                    results.append(exchange_rate)
-
-                    if exchange_rate.rate_value > 0:
-                        if "não é da data" in exchange_rate.status:
-                            warning_count += 1
-                            # Log já feito dentro do get_exchange_rate
-                        else:
-                            success_count += 1
-                            # Log já feito dentro do get_exchange_rate
-                    else:
-                        error_count += 1
-                        # Log já feito dentro do get_exchange_rate
+            # Navegador mantido de uma execução anterior: confirma que ainda responde
+            if self.driver is not None:
+                self.setup_driver()
 
-                except Exception as e:
-                    error_count += 1
+            max_workers = min(self.max_workers, total)
+            if max_workers > 1:
+                results = self._extract_parallel(
+                    currency_pairs, rate_date, max_workers)
+            else:
+                results = (
+                    self._extract_one(currency_pair, rate_date)
+                    for currency_pair in currency_pairs
+                )
 
-                    # Cria um registro de erro para manter o processamento das demais moedas
-                    results.append(
-                        ExchangeRate(
-                            from_currency=currency_pair.from_currency,
-                            to_currency=currency_pair.to_currency,
-                            rate_value=0.0,
-                            rate_date=rate_date,
-                            status=f"Erro: {str(e)}"
-                        )
-                    )
+            # Logs de cada consulta já foram feitos dentro do get_exchange_rate
+            for i, exchange_rate in enumerate(results, start=1):
+                if exchange_rate.rate_value > 0:
+                    if "não é da data" in exchange_rate.status:
+                        warning_count += 1
+                    else:
+                        success_count += 1
+                else:
+                    error_count += 1
 
-                # Um pequeno delay entre consultas para evitar bloqueio
-                time.sleep(2)
+                debug_log("DEBUG", f"Progresso: {i}/{total} cotações")
+                yield exchange_rate
 
             # Log de fim de processamento no formato padrão solicitado
             logger.info(
-                f"FIM - Processamento de cotações - Total: {len(currency_pairs)} consultas, {success_count} ok, {warning_count} com avisos, {error_count} com erros")
+                f"FIM - Processamento de cotações - Total: {total} consultas, {success_count} ok, {warning_count} com avisos, {error_count} com erros")
             debug_log(
                 "INFO", f"Extração concluída: {success_count} sucessos, {warning_count} avisos, {error_count} erros")
-            return results
 
         finally:
-            # Garante que o driver seja fechado ao final
-            self.close_driver()
+            # Garante que o driver seja fechado ao final (salvo se deve ser mantido entre execuções)
+            if not self.keep_driver:
+                self.close_driver()
+
+    def extract_all_exchange_rates(self, currency_pairs: List[CurrencyPair], rate_date: Optional[date] = None) -> List[ExchangeRate]:
+        """Extrai cotações para uma lista de pares de moedas"""
+        return list(self.iter_exchange_rates(currency_pairs, rate_date))
 
     def write_exchange_rates(self, exchange_rates: List[ExchangeRate], filename: Optional[str] = None) -> str:
         """Escreve as cotações em arquivo Excel com tratamento de erros de permissão"""
+        # Linhas do relatório (valor arredondado e data DD/MM/AAAA), sem passar por um DataFrame;
+        # montadas antes do try para que todos os caminhos de gravação as tenham
+        records = [rate.to_record() for rate in exchange_rates]
+
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             today = datetime.now().strftime("%Y%m%d")
 
-            # Gera um hash único para o arquivo baseado nas entradas
-            input_str = str(
-                [f"{rate.from_currency}{rate.to_currency}{rate.rate_value}" for rate in exchange_rates])
-            unique_hash = hashlib.md5(input_str.encode()).hexdigest()[:8]
+            # Gera um hash único para o arquivo baseado nas entradas, alimentado
+            # direto com os bytes de cada cotação (8 caracteres hexadecimais)
+            hasher = hashlib.blake2b(digest_size=4)
+            for rate in exchange_rates:
+                hasher.update(rate.from_currency.encode())
+                hasher.update(rate.to_currency.encode())
+                hasher.update(struct.pack("<d", rate.rate_value or 0.0))
+            unique_hash = hasher.hexdigest()
 
             # Cria o nome do arquivo
             if not filename:
                 filename = f"exchange_rates_{today}_{unique_hash}.xlsx"
 
             output_path = os.path.join(self.output_dir, filename)
-            main_dir_path = os.path.join(os.path.dirname(
-                os.path.abspath(__file__)), filename)
+            main_dir_path = os.path.join(_MODULE_DIR, filename)
 
             # Cria diretório de saída se não existir
-            os.makedirs(self.output_dir, exist_ok=True)
-
-            # Cria um DataFrame do pandas com os resultados
-            data = []
+            _ensure_dir(self.output_dir)
 
-            for rate in exchange_rates:
-                # Extrai os dados da taxa
-                from_currency = rate.from_currency
-                to_currency = rate.to_currency
-                rate_value = rate.rate_value  # Usa o valor real extraído
-
-                # Formata a data corretamente
-                if isinstance(rate.rate_date, date):
-                    date_str = rate.rate_date.strftime("%d/%m/%Y")
-                else:
-                    date_str = str(rate.rate_date)
-
-                # Define o status da cotação
-                status = rate.status
-
-                # Adiciona a linha ao dataframe
-                data.append({
-                    'Moeda entrada': from_currency,
-                    'Taxa': 1,
-                    'Moeda saída': to_currency,
-                    # Usa o valor real da cotação
-                    'Valor cotação': round(rate_value, 3) if rate_value else 0,
-                    'Data': date_str,
-                    'Status': status
-                })
-
-            # Cria o dataframe e salva como Excel
-            df = pd.DataFrame(data)
-
-            # Salva o arquivo no diretório de saída
-            df.to_excel(output_path, index=False)
+            # Salva o arquivo no diretório de saída (linha a linha, via xlsxwriter quando disponível)
+            save_records_to_excel(EXCHANGE_RATE_COLUMNS, records, output_path)
             debug_log(
                 "INFO", f"Arquivo Excel gerado com sucesso em: {output_path}")
 
             # Salva também no diretório principal para facilitar o acesso
-            df.to_excel(main_dir_path, index=False)
+            # (cópia do arquivo já gerado, sem serializar o workbook de novo)
+            shutil.copyfile(output_path, main_dir_path)
             debug_log(
                 "INFO", f"Arquivo Excel também salvo no diretório principal: {main_dir_path}")
 
@@ -1039,16 +1360,14 @@ class BCBAutomation:
             # Trata erro de permissão tentando salvar com nome alternativo
             alt_filename = f"exchange_rates_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}.xlsx"
             alt_output_path = os.path.join(self.output_dir, alt_filename)
-            alt_main_dir_path = os.path.join(os.path.dirname(
-                os.path.abspath(__file__)), alt_filename)
+            alt_main_dir_path = os.path.join(_MODULE_DIR, alt_filename)
 
             debug_log(
                 "WARNING", f"Erro de permissão ao salvar arquivo. Tentando nome alternativo: {alt_filename}")
 
             # Tenta salvar com o nome alternativo
-            df = pd.DataFrame(data)
-            df.to_excel(alt_output_path, index=False)
-            df.to_excel(alt_main_dir_path, index=False)
+            save_records_to_excel(EXCHANGE_RATE_COLUMNS, records, alt_output_path)
+            shutil.copyfile(alt_output_path, alt_main_dir_path)
 
             debug_log(
                 "INFO", f"Arquivo Excel salvo com nome alternativo: {alt_main_dir_path}")
@@ -1065,8 +1384,7 @@ class BCBAutomation:
                 temp_filename = f"exchange_rates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
                 temp_filepath = os.path.join(temp_dir, temp_filename)
 
-                df = pd.DataFrame(data)
-                df.to_excel(temp_filepath, index=False)
+                save_records_to_excel(EXCHANGE_RATE_COLUMNS, records, temp_filepath)
 
                 debug_log(
                     "INFO", f"Arquivo Excel salvo em diretório alternativo: {temp_filepath}")
@@ -1077,10 +1395,33 @@ class BCBAutomation:
                 raise ValueError(
                     f"Falha ao salvar arquivo Excel: {str(e)}, tentativa alternativa falhou: {str(e2)}")
 
+    @staticmethod
+    def save_results(exchange_rates: List[ExchangeRate], file_path: str) -> str:
+        """
+        Salva as cotações no formato indicado pela extensão do arquivo
+
+        .parquet (pyarrow, zstd) é o formato mais rápido de gravar e ler; .xlsx é gravado
+        linha a linha. Outras extensões não são suportadas.
+
+        Args:
+            exchange_rates: Cotações a salvar
+            file_path: Caminho do arquivo (.parquet ou .xlsx)
+
+        Returns:
+            str: Caminho do arquivo salvo, ou "" se o Parquet não pôde ser gerado
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".parquet":
+            return save_to_parquet(ExchangeRate.many_to_frame(exchange_rates), file_path)
+        if extension == ".xlsx":
+            records = [rate.to_record() for rate in exchange_rates]
+            return save_records_to_excel(EXCHANGE_RATE_COLUMNS, records, file_path)
+        raise ValueError(f"Formato de arquivo não suportado: {extension}")
+
     def run(self):
         """Executa o fluxo completo de automação"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             debug_log("INFO", "Iniciando automação de cotações do Banco Central")
 
             # Verifica se o arquivo de entrada existe, se não, cria
@@ -1107,8 +1448,14 @@ class BCBAutomation:
             # Gera o relatório
             output_file = self.write_exchange_rates(exchange_rates)
 
+            # Grava também as cotações em Parquet no diretório de saída, com o nome do relatório
+            parquet_file = os.path.join(
+                self.output_dir, os.path.splitext(os.path.basename(output_file))[0] + ".parquet")
+            if self.save_results(exchange_rates, parquet_file):
+                debug_log("INFO", f"Cotações também salvas em Parquet: {parquet_file}")
+
             # Calcula o tempo total de execução
-            elapsed_time = time.time() - start_time
+            elapsed_time = time.perf_counter() - start_time
 
             # Log de finalização
             debug_log(
@@ -1139,115 +1486,124 @@ def safe_input(prompt=""):
 
 def main():
     """Menu principal com tratamento seguro de streams"""
-    try:
-        # Garante que os streams estão funcionando
-        try:
-            os.system('cls' if os.name == 'nt' else 'clear')
-        except:
-            pass
-            
-        print("\n====== AUTOMAÇÃO DE COTAÇÕES DO BANCO CENTRAL ======")
-        print("1. Executar automação completa")
-        print("2. Debug do banner de cookies")
-        print("3. Criar arquivo de exemplo de cotações")
-        print("4. Executar automação com navegador visível")
-        print("5. Recriar arquivo de exemplo de cotações (substituir existente)")
-        print("0. Sair")
+    # Automações das opções 1 e 4, reaproveitadas entre execuções do menu
+    # (o navegador continua aberto e só é fechado ao sair)
+    automations = {}
 
-        option = safe_input("\nEscolha uma opção: ")
+    def get_automation(headless: bool) -> BCBAutomation:
+        if headless not in automations:
+            automations[headless] = BCBAutomation(
+                headless=headless, debug_screenshots=not headless, keep_driver=True)
+        return automations[headless]
 
-        if option == "1":
+    try:
+        # Volta ao menu em laço, sem recursão
+        while True:
+            # Garante que os streams estão funcionando
             try:
-                start_time = time.time()
-                automation = BCBAutomation()
-                output_file = automation.run()
-                elapsed_time = time.time() - start_time
+                os.system('cls' if os.name == 'nt' else 'clear')
+            except:
+                pass
+            
+            print("\n====== AUTOMAÇÃO DE COTAÇÕES DO BANCO CENTRAL ======")
+            print("1. Executar automação completa")
+            print("2. Debug do banner de cookies")
+            print("3. Criar arquivo de exemplo de cotações")
+            print("4. Executar automação com navegador visível")
+            print("5. Recriar arquivo de exemplo de cotações (substituir existente)")
+            print("0. Sair")
 
-                print(f"\nAutomação concluída em {elapsed_time:.2f} segundos.")
-                print(f"Relatório gerado em: {output_file}")
+            option = safe_input("\nEscolha uma opção: ")
 
-            except Exception as e:
-                print(f"\nErro na execução da automação: {str(e)}")
-                debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+            if option == "1":
+                try:
+                    start_time = time.perf_counter()
+                    automation = get_automation(headless=True)
+                    output_file = automation.run()
+                    elapsed_time = time.perf_counter() - start_time
 
-        elif option == "2":
-            try:
-                print("\n--- INICIANDO DEBUG DO BANNER DE COOKIES ---")
-                automation = BCBAutomation(headless=False, debug_screenshots=True)
-                automation.setup_driver()
+                    print(f"\nAutomação concluída em {elapsed_time:.2f} segundos.")
+                    print(f"Relatório gerado em: {output_file}")
 
+                except Exception as e:
+                    print(f"\nErro na execução da automação: {str(e)}")
+                    debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+
+            elif option == "2":
                 try:
-                    automation.driver.get("https://www.bcb.gov.br/conversao")
-                    time.sleep(5)
+                    print("\n--- INICIANDO DEBUG DO BANNER DE COOKIES ---")
+                    automation = BCBAutomation(headless=False, debug_screenshots=True)
+                    automation.setup_driver()
 
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"debug/initial_page_{timestamp}.png"
-                    os.makedirs("debug", exist_ok=True)
-                    automation.driver.save_screenshot(filename)
-                    print(f"Screenshot inicial salvo: {filename}")
+                    try:
+                        automation.driver.get("https://www.bcb.gov.br/conversao")
+                        time.sleep(5)
 
-                    automation._close_banners()
+                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                        filename = f"debug/initial_page_{timestamp}.png"
+                        _ensure_dir("debug")
+                        automation.driver.save_screenshot(filename)
+                        print(f"Screenshot inicial salvo: {filename}")
 
-                    time.sleep(5)
-                    after_filename = f"debug/after_banner_close_{timestamp}.png"
-                    automation.driver.save_screenshot(after_filename)
-                    print(f"Screenshot após interação com banner: {after_filename}")
+                        automation._close_banners()
 
-                    print("\nDebug do banner de cookies concluído!")
+                        time.sleep(5)
+                        after_filename = f"debug/after_banner_close_{timestamp}.png"
+                        automation.driver.save_screenshot(after_filename)
+                        print(f"Screenshot após interação com banner: {after_filename}")
 
-                finally:
-                    automation.close_driver()
+                        print("\nDebug do banner de cookies concluído!")
 
-            except Exception as e:
-                print(f"\nErro no debug do banner: {str(e)}")
-                debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+                    finally:
+                        automation.close_driver()
 
-        elif option == "3":
-            try:
-                automation = BCBAutomation()
-                filepath = automation.create_sample_input_file()
-                print(f"\nArquivo de exemplo criado em: {filepath}")
-            except Exception as e:
-                print(f"\nErro ao criar arquivo de exemplo: {str(e)}")
-                debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+                except Exception as e:
+                    print(f"\nErro no debug do banner: {str(e)}")
+                    debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
 
-        elif option == "4":
-            try:
-                start_time = time.time()
-                automation = BCBAutomation(headless=False, debug_screenshots=True)
-                output_file = automation.run()
-                elapsed_time = time.time() - start_time
+            elif option == "3":
+                try:
+                    automation = BCBAutomation()
+                    filepath = automation.create_sample_input_file()
+                    print(f"\nArquivo de exemplo criado em: {filepath}")
+                except Exception as e:
+                    print(f"\nErro ao criar arquivo de exemplo: {str(e)}")
+                    debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
 
-                print(f"\nAutomação concluída em {elapsed_time:.2f} segundos.")
-                print(f"Relatório gerado em: {output_file}")
+            elif option == "4":
+                try:
+                    start_time = time.perf_counter()
+                    automation = get_automation(headless=False)
+                    output_file = automation.run()
+                    elapsed_time = time.perf_counter() - start_time
 
-            except Exception as e:
-                print(f"\nErro na execução da automação: {str(e)}")
-                debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+                    print(f"\nAutomação concluída em {elapsed_time:.2f} segundos.")
+                    print(f"Relatório gerado em: {output_file}")
 
-        elif option == "5":
-            try:
-                automation = BCBAutomation()
-                filepath = automation.create_sample_input_file(force=True)
-                print(f"\nArquivo de exemplo recriado em: {filepath}")
-            except Exception as e:
-                print(f"\nErro ao recriar arquivo de exemplo: {str(e)}")
-                debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
+                except Exception as e:
+                    print(f"\nErro na execução da automação: {str(e)}")
+                    debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
 
-        elif option == "0":
-            print("\nEncerrando programa...")
-            # Restaura streams antes de sair
-            restore_streams()
-            return
+            elif option == "5":
+                try:
+                    automation = BCBAutomation()
+                    filepath = automation.create_sample_input_file(force=True)
+                    print(f"\nArquivo de exemplo recriado em: {filepath}")
+                except Exception as e:
+                    print(f"\nErro ao recriar arquivo de exemplo: {str(e)}")
+                    debug_log("ERROR", f"Erro detalhado: {traceback.format_exc()}", exc_info=True)
 
-        else:
-            print("\nOpção inválida! Por favor, escolha uma opção válida.")
+            elif option == "0":
+                print("\nEncerrando programa...")
+                # Restaura streams antes de sair
+                restore_streams()
+                break
 
-        # Input seguro para continuar
-        safe_input("\nPressione ENTER para continuar...")
-        
-        # Chama recursivamente para voltar ao menu
-        main()
+            else:
+                print("\nOpção inválida! Por favor, escolha uma opção válida.")
+
+            # Input seguro para continuar
+            safe_input("\nPressione ENTER para continuar...")
 
     except KeyboardInterrupt:
         print("\nPrograma interrompido pelo usuário.")
@@ -1256,6 +1612,9 @@ def main():
         print(f"\nErro inesperado: {str(e)}")
         debug_log("ERROR", f"Erro na interface principal: {traceback.format_exc()}", exc_info=True)
         restore_streams()
+    finally:
+        for automation in automations.values():
+            automation.close_driver()
 
 
 if __name__ == "__main__":
@@ -1 +1,28 @@
+from datetime import datetime
 
+import pandas as pd
+from dagster import build_asset_context
+
+from money.assets import analyze_exchange_rates
+
+
+def test_analyze_exchange_rates_conta_status_por_categoria():
+    """Contagem por código de categoria: categorias sem linhas e status vazios não entram"""
+    status = pd.Categorical(
+        ["Consulta ok", "Consulta ok", "Cotação não é da data solicitada", "Erro: timeout", None],
+        categories=["Consulta ok", "Cotação não é da data solicitada", "Erro: timeout", "Erro: sem uso"],
+    )
+    df = pd.DataFrame({
+        "Moeda entrada": ["USD", "EUR", "GBP", "JPY", "USD"],
+        "Status": status,
+    })
+    df.attrs["run_started_at"] = datetime(2026, 10, 15, 8, 0, 0)
+
+    stats = analyze_exchange_rates(build_asset_context(), df)
+
+    assert stats["total_cotacoes"] == 5
+    assert stats["cotacoes_ok"] == 2
+    assert stats["cotacoes_data_diferente"] == 1
+    assert stats["cotacoes_erro"] == 1
+    assert stats["moedas_unicas"] == 4
+    assert stats["data_execucao"] == "15/10/2026 08:00:00"
@@ -0,0 +1,19 @@
+import pytest
+
+from money.spiders.moedas_spider import MoedasSpider
+
+
+def test_find_rate_respeita_prioridade_dos_padroes():
+    """O padrão "1 USD = R$" tem prioridade mesmo aparecendo depois de "Resultado" no texto"""
+    text = "Resultado da conversão 5,4321 … Valor 1 USD = R$ 5,1234"
+    assert MoedasSpider._find_rate(text) == 5.1234
+
+
+@pytest.mark.parametrize("text", ["", "Erro 503 - serviço indisponível", "Total 123 de 456"])
+def test_find_rate_sem_numero_decimal(text):
+    """Texto sem nenhum número decimal não tem cotação"""
+    assert MoedasSpider._find_rate(text) == 0.0
+
+
+def test_find_rate_com_numero_decimal():
+    assert MoedasSpider._find_rate("1 USD = R$ 5,4321") == 5.4321
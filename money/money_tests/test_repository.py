@@ -0,0 +1,62 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from money import repository
+
+
+def test_load_cached_rates_usa_a_data_da_consulta(tmp_path, monkeypatch):
+    """A cotação salva é encontrada pela data da consulta, mesmo com a data da cotação anterior"""
+    pytest.importorskip("duckdb")
+    monkeypatch.setattr(repository, "DB_FILE", str(tmp_path / "data.duckdb"))
+    monkeypatch.setattr(repository, "_created_tables", set())
+
+    df = pd.DataFrame([{
+        "Moeda entrada": "USD",
+        "Taxa": 1,
+        "Moeda saída": "BRL",
+        "Valor cotação": 5.123,
+        "Data": "14/10/2026",
+        "Status": "Cotação não é da data solicitada",
+        repository.QUERY_DATE_COLUMN: "15/10/2026",
+    }])
+    assert repository.save_to_duckdb(df, "exchange_rates")
+
+    pairs = [SimpleNamespace(from_currency="USD", to_currency="BRL")]
+    cached = repository.load_cached_rates(pairs, date(2026, 10, 15))
+
+    assert list(cached) == [("USD", "BRL")]
+    assert cached[("USD", "BRL")]["Valor cotação"] == 5.123
+    assert repository.load_cached_rates(pairs, date(2026, 10, 14)) == {}
+
+
+def test_load_currency_pairs_ignora_celulas_vazias(tmp_path):
+    """Linhas com moeda em branco não viram pares (nem moedas como "nan" ou "None")"""
+    pytest.importorskip("openpyxl")
+    file_path = tmp_path / "currencies.xlsx"
+    pd.DataFrame({
+        "Moeda Origem": ["usd ", "EUR", None, None, "GBP"],
+        "Moeda Destino": [" brl", None, "BRL", None, "BRL"],
+    }).to_excel(file_path, index=False)
+
+    df = repository.load_currency_pairs(str(file_path))
+
+    assert list(zip(df["from_currency"], df["to_currency"])) == [("USD", "BRL"), ("GBP", "BRL")]
+
+
+def test_save_to_csv_cabecalho_com_chaves_mistas(tmp_path):
+    """Colunas na ordem em que aparecem nos dicionários; chaves ausentes ficam vazias"""
+    file_path = tmp_path / "rates.csv"
+    data = [
+        {"Moeda entrada": "USD", "Valor cotação": 5.1},
+        {"Moeda entrada": "EUR", "Status": "Consulta ok", "Valor cotação": 6.2},
+    ]
+
+    assert repository.save_to_csv(data, str(file_path)) == str(file_path)
+    assert file_path.read_text(encoding="utf-8").splitlines() == [
+        "Moeda entrada,Valor cotação,Status",
+        "USD,5.1,",
+        "EUR,6.2,Consulta ok",
+    ]
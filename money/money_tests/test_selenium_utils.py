@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from money.utils.selenium_utils import BCBAutomation, _is_plausible_rate, _parse_brl_number
+
+# Página com o card do formulário antes do card de resultado, como no conversor do BCB;
+# o resultado não traz "Data cotação utilizada", então a data vem do seletor alternativo
+CONVERSION_PAGE = """<html><body>
+<div class="card-body"><form><div>Data 01/01/2020</div><strong>Valor</strong> <strong>100,00</strong></form></div>
+<div class="card-body"><strong>Resultado da conversão:</strong> 5,4321<div>Data: 14/10/2026</div></div>
+</body></html>"""
+
+
+@pytest.fixture
+def chrome():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except WebDriverException as e:
+        pytest.skip(f"Chrome indisponível: {e}")
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1.234,56", 1234.56),
+        ("5,1234", 5.1234),
+        ("5.1234", 5.1234),
+        ("1.234.567,8", 1234567.8),
+        ("1.234", 1234.0),
+        ("12.345.678", 12345678.0),
+    ],
+)
+def test_parse_brl_number(value, expected):
+    """Separador de milhar removido e vírgula decimal convertida; sem vírgula, o ponto só é
+    decimal quando não separa grupos de três dígitos"""
+    assert _parse_brl_number(value) == pytest.approx(expected)
+
+
+def test_parse_brl_number_invalido():
+    with pytest.raises(ValueError):
+        _parse_brl_number("abc")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (0.01, True),
+        (5.4321, True),
+        (1000, True),
+        (0.005, False),
+        (1234.0, False),
+    ],
+)
+def test_is_plausible_rate(value, expected):
+    assert _is_plausible_rate(value) is expected
+
+
+def test_extract_result_usa_o_card_de_resultado(chrome, tmp_path):
+    """O card do formulário vem antes; texto e seletores alternativos leem o card de resultado"""
+    page = tmp_path / "conversao.html"
+    page.write_text(CONVERSION_PAGE, encoding="utf-8")
+    chrome.get(page.as_uri())
+    automation = BCBAutomation()
+    automation.driver = chrome
+    assert automation._extract_result() == (pytest.approx(5.4321), date(2026, 10, 14))
@@ -3,7 +3,11 @@ setup(
     packages=find_packages(exclude=["money_tests"]),
     install_requires=[
         "dagster",
-        "dagster-cloud"
+        "dagster-cloud",
+        "xlsxwriter",
+        "duckdb",
+        "pyarrow",
+        "lxml"
     ],
     extras_require={"dev": ["dagster-webserver", "pytest"]},
 )
\ No newline at end of file